@@ -31,13 +31,18 @@ from hypnos.components import (
     SeparatorPlate,
     FWBackplate
 )
-from hypnos.cubit_functions import to_volumes, get_entities_from_group
-from hypnos.geometry import Vertex, arctan
+from hypnos.cubit_functions import to_volumes, get_entities_from_group, get_id_string
+from hypnos.geometry import Vertex, hexagonal_lattice
 from hypnos.constants import (
     CLASS_MAPPING,
-    HCPB_BLANKET_REQUIREMENTS
+    HCPB_BLANKET_REQUIREMENTS,
+    HCPB_COMPONENT_ATTRIBUTES,
+    COS_30,
+    SIN_30
 )
-import numpy as np
+import functools
+import math
+from collections import deque
 
 
 class GenericComponentAssembly(ComponentBase):
@@ -46,33 +51,31 @@ class GenericComponentAssembly(ComponentBase):
     '''
     def __init__(self, classname, json_object):
         super().__init__(classname, json_object)
+        # change through add_components, or call clear_cache after changing directly
         self.components = []
+        # results of get_components_of_class, keyed by class or tuple of classes
+        self._class_cache = {}
+        # everything _walk yields, i.e. the tree with nested assemblies flattened out
+        self._leaves_cache = None
+        # assembly this was added to, its searches go stale when this one changes
+        self._parent = None
 
     # 'geometries' refer to CubitInstance objects
-    def get_geometries_from(self, class_list: list[str]) -> list[CubitInstance]:
+    def get_geometries_from(self, class_list: type | list | tuple) -> list[CubitInstance]:
         '''Get list of geometries with given classnames
 
         Parameters
         ----------
-        class_list : list[str]
-            list of classnames
+        class_list : type | list | tuple
+            component class or collection of component classes
 
         Returns
         -------
         list[CubitInstance]
             list of geometries
         '''
-        component_list = []
-        for component in self.get_components():
-            for component_class in class_list:
-                if isinstance(component, component_class):
-                    if isinstance(component, CubitInstance):
-                        component_list.append(component)
-                    elif isinstance(component, SimpleComponent):
-                        component_list += component.subcomponents
-                    elif isinstance(component, GenericComponentAssembly):
-                        component_list += component.get_geometries_from(class_list)
-        return component_list
+        class_tuple = (class_list,) if isinstance(class_list, type) else tuple(class_list)
+        return self._collect_geometries(self._walk(class_tuple))
 
     def find_parent_component(self, geometry: CubitInstance):
         '''If this assembly contains given geometry, return owning component.
@@ -88,30 +91,57 @@ class GenericComponentAssembly(ComponentBase):
         SimpleComponent | None
             Parent component | None
         '''
-        for component in self.get_components():
+        for component in self._leaves():
             if isinstance(component, SimpleComponent):
                 for component_geometry in component.get_geometries():
                     if isinstance(component_geometry, CubitInstance):
                         if str(geometry) == str(component_geometry):
                             return component
-            elif isinstance(component, GenericComponentAssembly):
-                found_component = component.find_parent_component(geometry)
-                if found_component:
-                    return found_component
         return None
 
     def get_geometries(self):
+        # only the flattened tree is cached. components swap their
+        # geometries in place, e.g. SimpleComponent.as_volumes
+        return self._collect_geometries(self._leaves())
+
+    def _leaves(self) -> list:
+        '''Cached result of an unfiltered _walk.
+        The returned list is shared with the cache, do not modify it.'''
+        if self._leaves_cache is None:
+            self._leaves_cache = list(self._walk())
+        return self._leaves_cache
+
+    def _walk(self, class_tuple: tuple = None):
+        '''Depth-first walk over the contents of this assembly, in order.
+        Nested assemblies are descended into rather than yielded.
+        If class_tuple is given, anything not of those classes is skipped,
+        including assemblies.'''
+        # children are pushed reversed so they pop off in order
+        stack = deque(reversed(self.get_components()))
+        while stack:
+            component = stack.pop()
+            if class_tuple is not None and not isinstance(component, class_tuple):
+                continue
+            if component_kind(component) == ASSEMBLY_KIND:
+                stack.extend(reversed(component.get_components()))
+            else:
+                yield component
+
+    @staticmethod
+    def _collect_geometries(components) -> list[CubitInstance]:
+        '''Flatten components and geometries into a list of geometries'''
         instances_list = []
-        for component in self.get_components():
-            if isinstance(component, CubitInstance):
-                instances_list.append(component)
-            elif isinstance(component, ComponentBase):
+        for component in components:
+            kind = component_kind(component)
+            # simple components know how to list their geometries
+            if kind == COMPONENT_KIND:
                 instances_list.extend(component.get_geometries())
+            elif kind == GEOMETRY_KIND:
+                instances_list.append(component)
         return instances_list
 
     def get_volumes_list(self) -> list[int]:
-        volumes_list = to_volumes(self.get_all_geometries())
-        return [volume.cid for volume in volumes_list]
+        return [volume.cid for volume in to_volumes(self.get_geometries())]
 
     def get_components(self) -> list:
         '''Return components stored in this assembly at the top-level,
@@ -132,41 +162,117 @@ class GenericComponentAssembly(ComponentBase):
         list[SimpleComponent]
             list of simple components
         '''
-        instances_list = []
-        for component in self.get_components():
-            if isinstance(component, SimpleComponent):
-                instances_list.append(component)
-            elif isinstance(component, GenericComponentAssembly):
-                instances_list.extend(component.get_all_components())
-        return instances_list
+        return [component for component in self._leaves() if isinstance(component, SimpleComponent)]
 
-    def get_components_of_class(self, classes: list) -> list:
+    def get_components_of_class(self, classes: type | list | tuple) -> list:
         '''Find components of with given classnames.
         Searches through assemblies recursively.
 
         Parameters
         ----------
-        classes : list
-            list of component classes
+        classes : type | list | tuple
+            component class or collection of component classes
+
+        Returns
+        -------
+        list
+            list of components
+        '''
+        # a lone class is used as is, isinstance and the cache take either form
+        if not isinstance(classes, type):
+            classes = tuple(classes)
+        return list(self._components_of_class(classes))
+
+    def _components_of_class(self, classes: type | tuple) -> list:
+        '''Cached search behind get_components_of_class.
+        The returned list is shared with the cache, do not modify it.'''
+        try:
+            return self._class_cache[classes]
+        except KeyError:
+            component_list = self.find_components_of_class(classes)
+            self._class_cache[classes] = component_list
+            return component_list
+
+    def find_components_of_class(self, classes: type | list | tuple) -> list:
+        '''Uncached search for components of given classes.
+
+        Parameters
+        ----------
+        classes : type | list | tuple
+            component class or collection of component classes
 
         Returns
         -------
         list
             list of components
         '''
+        if not isinstance(classes, type):
+            classes = tuple(classes)
         component_list = []
-        if type(classes) is not list:
-            classes = [classes]
-        for component in self.get_components():
-            for component_class in classes:
-                if isinstance(component, component_class):
-                    component_list.append(component)
-                elif isinstance(component, GenericComponentAssembly):
-                    component_list += component.get_components_of_class(classes)
+        stack = deque(reversed(self.get_components()))
+        while stack:
+            component = stack.pop()
+            if isinstance(component, classes):
+                component_list.append(component)
+            elif isinstance(component, GenericComponentAssembly):
+                stack.extend(reversed(component.get_components()))
         return component_list
 
+    def partition_components_by_class(self, classes: list | tuple) -> dict:
+        '''Find components of each of the given classes in a single walk.
+        Each list matches what get_components_of_class would return for that class.
+
+        Parameters
+        ----------
+        classes : list | tuple
+            collection of component classes
+
+        Returns
+        -------
+        dict
+            {class: list of components}
+        '''
+        partitions = {component_class: [] for component_class in classes}
+        # track which classes an ancestor already matched, those don't descend further
+        stack = deque((component, ()) for component in reversed(self.get_components()))
+        while stack:
+            component, matched = stack.pop()
+            for component_class in partitions:
+                if component_class not in matched and isinstance(component, component_class):
+                    partitions[component_class].append(component)
+                    matched += (component_class,)
+            if len(matched) < len(partitions) and isinstance(component, GenericComponentAssembly):
+                stack.extend((child, matched) for child in reversed(component.get_components()))
+        return partitions
+
+    def add_components(self, *components):
+        '''Add components to this assembly and forget cached searches
+
+        Parameters
+        ----------
+        components : SimpleComponent | GenericComponentAssembly | CubitInstance
+            components to add
+        '''
+        for component in components:
+            if isinstance(component, GenericComponentAssembly):
+                component._parent = self
+        self.components.extend(components)
+        self.clear_cache()
+
+    def clear_cache(self):
+        '''Forget the results of previous component searches and walks,
+        both here and in every assembly this one was added to.
+        This needs to be called whenever self.components is changed
+        without going through add_components.
+        '''
+        assembly = self
+        while assembly is not None:
+            assembly._class_cache = {}
+            assembly._leaves_cache = None
+            assembly = assembly._parent
+
     def set_mesh_size(self, component_classes: list, size: int):
-        component_classes = [globals()[CLASS_MAPPING[classname]] for classname in component_classes]
+        component_classes = [get_constructor(classname) for classname in component_classes]
         components = self.get_components_of_class(component_classes)
         for component in components:
             if isinstance(component, SimpleComponent):
@@ -184,7 +290,7 @@ class CreatedComponentAssembly(GenericComponentAssembly):
 
     def __init__(self, classname, required_classnames: list, json_object: dict):
         self.required_classnames = required_classnames
-        if "components" in json_object.keys():
+        if "components" in json_object:
             if type(json_object["components"]) is dict:
                 self.component_list = json_object["components"].values()
             else:
@@ -200,7 +306,7 @@ class CreatedComponentAssembly(GenericComponentAssembly):
     def check_for_overlaps(self):
         '''Raise an error if any overlaps exist between children volumes
         '''
-        volume_ids_list = [i.cid for i in to_volumes(self.get_geometries())]
+        volume_ids_list = self.get_volumes_list()
         overlaps = cubit.get_overlapping_volumes(volume_ids_list)
         if overlaps != ():
             overlapping_components = [self.find_parent_component(CubitInstance(overlap_vol_id, "volume")) for overlap_vol_id in overlaps]
@@ -211,15 +317,16 @@ class CreatedComponentAssembly(GenericComponentAssembly):
         '''Make sure an instance of this class contains the required components.
         This looks at the classnames specified in the json file'''
         class_list = [i["class"] for i in self.component_list]
-        for classes_required in self.required_classnames:
-            if classes_required not in class_list:
-                # Can change this to a warning, for now it just throws an error
-                raise CubismError(f"This assembly must contain: {self.required_classnames}. Currently contains: {class_list}")
+        class_set = set(class_list)
+        missing_classes = [required for required in self.required_classnames if required not in class_set]
+        if missing_classes:
+            # Can change this to a warning, for now it just throws an error
+            raise CubismError(f"This assembly must contain: {self.required_classnames}. Currently contains: {class_list}. Missing: {missing_classes}")
 
     def setup_assembly(self):
         '''Instantiate components in cubit'''
         for component_json_dict in self.component_list:
-            self.components.append(construct(component_json_dict))
+            self.add_components(construct(component_json_dict))
 
     def check_sanity(self):
         '''Check whether geometrical parameters are physical on the
@@ -251,14 +358,16 @@ class ExternalComponentAssembly(GenericComponentAssembly):
 
         # import the bodies in a temporary group
         temp_group_name = str(self.group) + "_temp"
-        print(f'import "{self.filepath}" heal group "{temp_group_name}"')
         cmd(f'import "{self.filepath}" heal group "{temp_group_name}"')
         temp_group_id = cubit.get_id_from_name(temp_group_name)
 
         # convert everything to volumes
         volumes_list = to_volumes([CubitInstance(cid, "body") for cid in get_entities_from_group(temp_group_id, "body")])
+        volumes_by_type = {}
         for volume in volumes_list:
-            cmd(f'group "{self.group}" add {volume.geometry_type} {volume.cid}')
+            volumes_by_type.setdefault(volume.geometry_type, []).append(volume)
+        for geometry_type, volumes in volumes_by_type.items():
+            cmd(f'group "{self.group}" add {geometry_type} {get_id_string(volumes)}')
         print(f"volumes imported in group {self.group}")
 
         # cleanup
@@ -266,20 +375,18 @@ class ExternalComponentAssembly(GenericComponentAssembly):
 
     def get_group_id(self):
         '''Get ID of group (group needs to exist first)'''
-        for (group_name, group_id) in cubit.group_names_ids():
-            if group_name == self.group:
-                return group_id
-        raise CubismError("Can't find group ID?????")
+        group_id = cubit.get_id_from_name(self.group)
+        if group_id == 0:
+            raise CubismError("Can't find group ID?????")
+        return group_id
 
     def add_volumes_and_bodies(self):
         '''Add volumes and bodies in group to this assembly as
         ExternalComponent objects'''
         source_volume_ids = cubit.get_group_volumes(self.group_id)
-        for volume_id in source_volume_ids:
-            self.components.append(ExternalComponent(volume_id, "volume"))
+        self.add_components(*(ExternalComponent(volume_id, "volume") for volume_id in source_volume_ids))
         source_body_ids = cubit.get_group_bodies(self.group_id)
-        for body_id in source_body_ids:
-            self.components.append(ExternalComponent(body_id, "body"))
+        self.add_components(*(ExternalComponent(body_id, "body") for body_id in source_body_ids))
 
 
 class PinAssembly(CreatedComponentAssembly):
@@ -290,18 +397,19 @@ class PinAssembly(CreatedComponentAssembly):
         super().__init__("pin", [], json_object)
 
     def check_sanity(self):
-        cladding_radius = self.geometry["coolant inlet radius"] + self.geometry["inner cladding"] + self.geometry["breeder chamber thickness"] + self.geometry["outer cladding"]
-        if self.geometry["pressure tube outer radius"] - self.geometry["pressure tube thickness"] < cladding_radius:
+        geometry = self.geometry
+        cladding_radius = geometry["coolant inlet radius"] + geometry["inner cladding"] + geometry["breeder chamber thickness"] + geometry["outer cladding"]
+        if geometry["pressure tube outer radius"] - geometry["pressure tube thickness"] < cladding_radius:
             raise ValueError("cladding radius larger than pressure tube radius")
 
     def setup_assembly(self):
         cladding_json = self.__get_cladding_parameters()
-        pressure_tube_geometry = self.__extract_parameters({
+        pressure_tube_geometry = self.__rename_parameters({
             "pressure tube outer radius": "outer radius",
             "pressure tube thickness": "thickness",
             "pressure tube length": "length"
         })
-        multiplier_geometry = self.__extract_parameters({
+        multiplier_geometry = self.__rename_parameters({
             "multiplier length": "length",
             "multiplier side": "side",
             "pressure tube outer radius": "inner radius"
@@ -321,24 +429,22 @@ class PinAssembly(CreatedComponentAssembly):
         coolant = PinCoolant(coolant_json)
         purge_gas = PurgeGasComponent(purge_gas_json)
 
-        self.components.extend([cladding, pressure_tube, multiplier, breeder, filter_disk, filter_lid, coolant, purge_gas])
+        self.add_components(cladding, pressure_tube, multiplier, breeder, filter_disk, filter_lid, coolant, purge_gas)
         # align with z-axis properly
         self.rotate(90, Vertex(0, 0, 0), Vertex(0, 1, 0))
 
-    def __extract_parameters(self, parameters: list | dict):
-        out_dict = {}
-        if type(parameters) is list:
-            for parameter in parameters:
-                out_dict[parameter] = self.geometry[parameter]
-        elif type(parameters) is dict:
-            for fetch_parameter, out_parameter in parameters.items():
-                out_dict[out_parameter] = self.geometry[fetch_parameter]
-        else:
-            raise CubismError(f"parameters type not recognised: {type(parameters)}")
-        return out_dict
+    def __copy_parameters(self, parameters: list[str]) -> dict:
+        '''Copy named parameters out of this pin's geometry'''
+        geometry = self.geometry
+        return {parameter: geometry[parameter] for parameter in parameters}
+
+    def __rename_parameters(self, parameters: dict[str, str]) -> dict:
+        '''Copy parameters out of this pin's geometry under new names'''
+        geometry = self.geometry
+        return {out_parameter: geometry[fetch_parameter] for fetch_parameter, out_parameter in parameters.items()}
 
     def __get_cladding_parameters(self):
-        parameters = self.__extract_parameters(["outer length", "inner length", "offset", "bluntness", "inner cladding", "outer cladding", "breeder chamber thickness", "coolant inlet radius", "purge duct thickness", "purge duct cladding", "purge duct offset", "filter disk thickness"])
+        parameters = self.__copy_parameters(["outer length", "inner length", "offset", "bluntness", "inner cladding", "outer cladding", "breeder chamber thickness", "coolant inlet radius", "purge duct thickness", "purge duct cladding", "purge duct offset", "filter disk thickness"])
         parameters["distance to step"] = self.geometry["filter lid length"] + self.geometry["filter disk thickness"] + self.geometry["inner length"] - (self.geometry["offset"] + self.geometry["outer length"])
         parameters["distance to disk"] = parameters["distance to step"] - self.geometry["filter lid length"]
         start_x = self.geometry["pressure tube gap"] + self.geometry["pressure tube thickness"]
@@ -355,14 +461,14 @@ class PinAssembly(CreatedComponentAssembly):
         outer_cladding = geometry["outer cladding"]
         filter_disc_thickness = geometry["filter disk thickness"]
 
-        slope_angle = np.arctan((inner_cladding + breeder_chamber_thickness + outer_cladding) / offset)
+        slope_angle = math.atan((inner_cladding + breeder_chamber_thickness + outer_cladding) / offset)
 
-        parameters = self.__extract_parameters(["bluntness"])
+        parameters = self.__copy_parameters(["bluntness"])
         parameters["inner radius"] = coolant_inlet_radius + inner_cladding
         parameters["outer radius"] = coolant_inlet_radius + inner_cladding + breeder_chamber_thickness
-        parameters["chamber offset"] = outer_cladding/np.sin(slope_angle) + inner_cladding/np.tan(slope_angle)
+        parameters["chamber offset"] = outer_cladding/math.sin(slope_angle) + inner_cladding/math.tan(slope_angle)
         parameters["length"] = offset + outer_length - (filter_disc_thickness + parameters["chamber offset"])
-        parameters["offset"] = geometry["offset"] + (outer_cladding*np.tan(slope_angle/2)) - parameters["chamber offset"]
+        parameters["offset"] = geometry["offset"] + (outer_cladding*math.tan(slope_angle/2)) - parameters["chamber offset"]
 
         start_x = parameters["chamber offset"] + geometry["pressure tube gap"] + geometry["pressure tube thickness"]
 
@@ -374,7 +480,7 @@ class PinAssembly(CreatedComponentAssembly):
         inner_cladding = geometry["inner cladding"]
         breeder_chamber_thickness = geometry["breeder chamber thickness"]
 
-        parameters = self.__extract_parameters({
+        parameters = self.__rename_parameters({
             "breeder chamber thickness": "thickness",
             "filter disk thickness": "length"
         })
@@ -384,23 +490,25 @@ class PinAssembly(CreatedComponentAssembly):
         return self.__jsonify(parameters, "filter disk", start_x)
 
     def __get_filter_lid_parameters(self):
-        parameters = self.__extract_parameters({"purge duct cladding": "thickness", 
+        parameters = self.__rename_parameters({"purge duct cladding": "thickness", 
                                                 "filter lid length": "length"})
-        parameters["outer radius"] = self.geometry["coolant inlet radius"] + self.geometry["inner cladding"]
+        geometry = self.geometry
+        parameters["outer radius"] = geometry["coolant inlet radius"] + geometry["inner cladding"]
 
-        start_x = self.geometry["pressure tube gap"] + self.geometry["pressure tube thickness"]
-        start_x = start_x + self.geometry["outer length"] + self.geometry["offset"] - (self.geometry["filter disk thickness"] + self.geometry["filter lid length"])
+        start_x = geometry["pressure tube gap"] + geometry["pressure tube thickness"]
+        start_x = start_x + geometry["outer length"] + geometry["offset"] - (geometry["filter disk thickness"] + geometry["filter lid length"])
 
         return self.__jsonify(parameters, "filter lid", start_x)
 
     def __get_purge_gas_parameters(self):
-        parameters = self.__extract_parameters({"purge duct thickness": "thickness"})
-        parameters["outer radius"] = self.geometry["coolant inlet radius"] + self.geometry["inner cladding"] - self.geometry["purge duct cladding"]
-        added_extension = self.geometry["inner length"] - (self.geometry["outer length"] + self.geometry["offset"] + self.geometry["purge duct offset"])
-        parameters["length"] = self.geometry["filter lid length"] + self.geometry["filter disk thickness"] + added_extension
+        geometry = self.geometry
+        parameters = self.__rename_parameters({"purge duct thickness": "thickness"})
+        parameters["outer radius"] = geometry["coolant inlet radius"] + geometry["inner cladding"] - geometry["purge duct cladding"]
+        added_extension = geometry["inner length"] - (geometry["outer length"] + geometry["offset"] + geometry["purge duct offset"])
+        parameters["length"] = geometry["filter lid length"] + geometry["filter disk thickness"] + added_extension
 
-        start_x = self.geometry["pressure tube gap"] + self.geometry["pressure tube thickness"]
-        start_x = start_x + self.geometry["outer length"] + self.geometry["offset"] - (self.geometry["filter disk thickness"] + self.geometry["filter lid length"])
+        start_x = geometry["pressure tube gap"] + geometry["pressure tube thickness"]
+        start_x = start_x + geometry["outer length"] + geometry["offset"] - (geometry["filter disk thickness"] + geometry["filter lid length"])
 
         return self.__jsonify(parameters, "purge gas", start_x)
 
@@ -411,7 +519,7 @@ class PinAssembly(CreatedComponentAssembly):
         pressure_tube_length = geometry["pressure tube length"]
         pressure_tube_outer_radius = geometry["pressure tube outer radius"]
 
-        parameters = self.__extract_parameters(["coolant inlet radius", "inner length", "offset", "bluntness"])
+        parameters = self.__copy_parameters(["coolant inlet radius", "inner length", "offset", "bluntness"])
         parameters["pressure tube length"] = pressure_tube_length - pressure_tube_thickness
         parameters["pressure tube gap"] = pressure_tube_gap
         parameters["pressure tube radius"] = pressure_tube_outer_radius - pressure_tube_thickness
@@ -452,13 +560,13 @@ class HCPBBlanket(CreatedComponentAssembly):
         if self.first_wall_geometry["length"] - distance_to_sep_plate < self.geometry["FW backplate thickness"]:
             raise ValueError("First wall length too short")
 
-        row_pins, horizontal_start_pos = self.__get_pin_start_params()
+        row_pins, horizontal_start_pos = self._pin_start_params
         for pin_number in self.geometry["front rib positions"]:
             if pin_number > row_pins:
                 raise ValueError(f"Specified parameters only tile {row_pins} pins in a row on the first wall, but trying to place front rib after pin number {pin_number}")
 
-        first_wall_slope_angle = arctan(self.first_wall_geometry["length"], (self.first_wall_geometry["outer width"] - self.first_wall_geometry["inner width"])/2)
-        distance_to_pin_centre = self.first_wall_geometry["inner width"]/2 - (np.abs(horizontal_start_pos) - self.first_wall_geometry["sidewall thickness"]/np.sin(first_wall_slope_angle))
+        fw_sidewall_horizontal = self._fw_slope[1]
+        distance_to_pin_centre = self.first_wall_geometry["inner width"]/2 - (abs(horizontal_start_pos) - fw_sidewall_horizontal)
         distance_to_multiplier = distance_to_pin_centre - bu_geometry["multiplier side"]
         distance_to_pin_inner = distance_to_pin_centre - (bu_geometry["coolant inlet radius"] + bu_geometry["inner cladding"])
         distance_to_pin_outer = distance_to_pin_inner - (bu_geometry["breeder chamber thickness"] + bu_geometry["outer cladding"])
@@ -497,9 +605,9 @@ class HCPBBlanket(CreatedComponentAssembly):
 
         FW_backplate_distance_from_FW = self.first_wall_geometry["length"] - self.geometry["FW backplate thickness"]
         backplate_extent = self.__get_plate_length_and_ext(FW_backplate_distance_from_FW, 0)[0]/2
-        if np.abs(rib_positions[0]) + self.back_ribs_geometry["thickness"]/2 > backplate_extent:
+        if abs(rib_positions[0]) + self.back_ribs_geometry["thickness"]/2 > backplate_extent:
             raise ValueError("Left side of back rib too thick - overlapping with first wall")
-        elif np.abs(rib_positions[-1]) + self.back_ribs_geometry["thickness"]/2 > backplate_extent:
+        elif abs(rib_positions[-1]) + self.back_ribs_geometry["thickness"]/2 > backplate_extent:
             raise ValueError("Right side of back rib too thick - overlapping with first wall")
         for i in range(len(rib_positions)-1):
             if rib_positions[i+1] - rib_positions[i] <= self.back_ribs_geometry["thickness"]:
@@ -508,59 +616,48 @@ class HCPBBlanket(CreatedComponentAssembly):
     def check_slope(self, distance_to_edge, vertical_extent, error_message):
         fw_offset = (self.first_wall_geometry["outer width"] - self.first_wall_geometry["inner width"])/2
         if fw_offset < 0:
-            if np.abs(self.first_wall_geometry["length"]/fw_offset) < np.abs(vertical_extent/distance_to_edge):
+            if abs(self.first_wall_geometry["length"]/fw_offset) < abs(vertical_extent/distance_to_edge):
                 raise ValueError(error_message)
 
     def setup_assembly(self):
         pin_positions = self.__tile_pins()
 
-        self.components.append(FirstWallComponent({"geometry": self.first_wall_geometry, "material": self.first_wall_material}))
+        self.add_components(FirstWallComponent({"geometry": self.first_wall_geometry, "material": self.first_wall_material}))
 
         bz_backplate_json = self.__get_bz_backplate_json()
-        self.components.append(BZBackplate(bz_backplate_json, pin_positions))
+        self.add_components(BZBackplate(bz_backplate_json, pin_positions))
 
         front_rib_geometry, front_rib_positions = self.__get_front_ribs_params()
         front_rib_thickness = self.front_ribs_geometry["thickness"]
-        for front_rib_pos in front_rib_positions:
-            self.components.append(FrontRib({"geometry": front_rib_geometry, "material": self.first_wall_material, "origin": front_rib_pos}))
+        self.add_components(*(FrontRib({"geometry": front_rib_geometry, "material": self.first_wall_material, "origin": front_rib_pos}) for front_rib_pos in front_rib_positions))
 
         purge_gas_hole_positions = self.__sort_pin_positions(pin_positions)
         purge_gas_front_plate_json = self.__get_pg_front_plate_json()
-        self.components.append(PurgeGasPlate("purge_gas_front", purge_gas_front_plate_json, front_rib_positions, front_rib_thickness, purge_gas_hole_positions))
+        self.add_components(PurgeGasPlate("purge_gas_front", purge_gas_front_plate_json, front_rib_positions, front_rib_thickness, purge_gas_hole_positions))
 
         purge_gas_mid_plate_json = self.__get_pg_mid_plate_json()
-        self.components.append(PurgeGasPlate("purge_gas_mid", purge_gas_mid_plate_json, front_rib_positions, front_rib_thickness, purge_gas_hole_positions))
+        self.add_components(PurgeGasPlate("purge_gas_mid", purge_gas_mid_plate_json, front_rib_positions, front_rib_thickness, purge_gas_hole_positions))
 
         purge_gas_back_plate_json = self.__get_pg_back_plate_json()
-        self.components.append(PurgeGasPlate("purge_gas_back", purge_gas_back_plate_json, front_rib_positions, front_rib_thickness, purge_gas_hole_positions))
+        self.add_components(PurgeGasPlate("purge_gas_back", purge_gas_back_plate_json, front_rib_positions, front_rib_thickness, purge_gas_hole_positions))
 
         back_rib_geometry, back_rib_positions = self.__get_back_ribs_params()
-        for back_rib_pos in back_rib_positions:
-            self.components.append(BackRib({"geometry": back_rib_geometry, "material": self.first_wall_material, "origin": back_rib_pos}))
+        self.add_components(*(BackRib({"geometry": back_rib_geometry, "material": self.first_wall_material, "origin": back_rib_pos}) for back_rib_pos in back_rib_positions))
 
         co_plenum_json = self.__get_cop_json()
-        self.components.append(CoolantOutletPlenum(co_plenum_json, back_rib_positions, self.back_ribs_geometry["thickness"]))
+        self.add_components(CoolantOutletPlenum(co_plenum_json, back_rib_positions, self.back_ribs_geometry["thickness"]))
 
         sep_plate_json = self.__get_separator_plate_json()
-        self.components.append(SeparatorPlate(sep_plate_json, back_rib_positions, self.back_ribs_geometry["thickness"]))
+        self.add_components(SeparatorPlate(sep_plate_json, back_rib_positions, self.back_ribs_geometry["thickness"]))
 
         fw_backplate_geometry = self.__get_fw_backplate_params()
-        self.components.append(FWBackplate({"geometry": fw_backplate_geometry, "material": self.first_wall_material}))
+        self.add_components(FWBackplate({"geometry": fw_backplate_geometry, "material": self.first_wall_material}))
 
     def __add_component_attributes(self):
         for component in self.component_list:
-            if component["class"] == "first_wall":
-                self.first_wall_geometry = component["geometry"]
-                self.first_wall_material = component["material"]
-            elif component["class"] == "pin":
-                self.breeder_materials = component["material"]
-                self.breeder_geometry = component["geometry"]
-            elif component["class"] == "front_rib":
-                self.front_ribs_geometry = component["geometry"]
-            elif component["class"] == "back_rib":
-                self.back_ribs_geometry = component["geometry"]
-            elif component["class"] == "coolant_outlet_plenum":
-                self.cop_geometry = component["geometry"]
+            attributes = HCPB_COMPONENT_ATTRIBUTES.get(component["class"], {})
+            for json_key, attribute in attributes.items():
+                setattr(self, attribute, component[json_key])
 
     def __dict_with_height(self):
         return {"height": self.first_wall_geometry["height"]}
@@ -579,7 +676,8 @@ class HCPBBlanket(CreatedComponentAssembly):
         '''
         return {"geometry": geometry, "material": self.first_wall_material, "origin": Vertex(0, 0, origin_z_coord)}
 
-    def __get_pin_start_params(self):
+    @functools.cached_property
+    def _pin_start_params(self):
         '''Calculate the number of pins that fit in a 'row' for tiling breeder pins on the first wall. 
         Also calculate the x-coordinate of the furthest along the -x axis.
 
@@ -590,8 +688,8 @@ class HCPBBlanket(CreatedComponentAssembly):
         pin_spacing = self.geometry["pin spacing"]
         accessible_width = self.first_wall_geometry["inner width"] - 2*(self.geometry["pin horizontal offset"] + self.first_wall_geometry["bluntness"])
 
-        row_pins = int((accessible_width - 2*multiplier_side) // (pin_spacing * np.cos(np.pi/6))) + 1
-        horizontal_start_pos = -(row_pins-1)*pin_spacing*np.cos(np.pi/6) / 2
+        row_pins = int((accessible_width - 2*multiplier_side) // (pin_spacing * COS_30)) + 1
+        horizontal_start_pos = -(row_pins-1)*pin_spacing*COS_30 / 2
         return row_pins, horizontal_start_pos
 
     def __tile_pins(self):
@@ -607,45 +705,68 @@ class HCPBBlanket(CreatedComponentAssembly):
         # 'accessible' for tiling breeder units
         accessible_height = height - 2*vertical_offset
         # hexagonally tiled breeder units are broken up into 'rows' and 'columns'
-        row_pins, horizontal_start_pos = self.__get_pin_start_params() 
+        row_pins, horizontal_start_pos = self._pin_start_params
         self.first_wall_geometry["pin horizontal start"] = horizontal_start_pos
         # each column 'index' has breeder units at 2 different heights
-        columns_indices = int((accessible_height - 2*multiplier_side*np.cos(np.pi/6)) // pin_spacing) + 1
+        columns_indices = int((accessible_height - 2*multiplier_side*COS_30) // pin_spacing) + 1
         # number of distinct heights we can place breeder units
-        distinct_pin_heights = int((accessible_height - 2*multiplier_side*np.cos(np.pi/6)) // (pin_spacing*np.sin(np.pi/6))) + 1
-        centering_vertical_offset = ((accessible_height - 2*multiplier_side*np.cos(np.pi/6)) - (distinct_pin_heights-1)*pin_spacing*np.sin(np.pi/6)) / 2
-        vertical_start_pos = height - (vertical_offset + centering_vertical_offset + multiplier_side*np.cos(np.pi/6))
+        distinct_pin_heights = int((accessible_height - 2*multiplier_side*COS_30) // (pin_spacing*SIN_30)) + 1
+        centering_vertical_offset = ((accessible_height - 2*multiplier_side*COS_30) - (distinct_pin_heights-1)*pin_spacing*SIN_30) / 2
+        vertical_start_pos = height - (vertical_offset + centering_vertical_offset + multiplier_side*COS_30)
+
+        pin_x, pin_y, fits = hexagonal_lattice(row_pins, columns_indices, pin_spacing, horizontal_start_pos, vertical_start_pos, distinct_pin_heights)
+        pin_z = length - wall_thickness
 
         pin_positions = [[] for j in range(columns_indices)]
-        for j in range(columns_indices):
-            pin_pos = Vertex(horizontal_start_pos, vertical_start_pos, length-wall_thickness) + Vertex(0, -pin_spacing*j)
-            for i in range(row_pins):
-                # stop tiling if we overshoot the number of column pins (each column index corresponds to 2 column pins)
-                if (j*2)+1 + (i%2) <= distinct_pin_heights:
+        pin_origins = []
+        for j, (row_x, row_y, row_fits) in enumerate(zip(pin_x.tolist(), pin_y.tolist(), fits.tolist())):
+            for x, y, pin_fits in zip(row_x, row_y, row_fits):
+                if pin_fits:
+                    pin_pos = Vertex(x, y, pin_z)
                     pin_positions[j].append(pin_pos)
-                    self.components.append(PinAssembly({"material":self.breeder_materials, "geometry":self.breeder_geometry, "origin":pin_pos}))
+                    pin_origins.append(pin_pos)
                 else:
                     pin_positions[j].append(False)
-                pin_pos = pin_pos + Vertex(pin_spacing).rotate(((-1)**(i+1))*np.pi/6)
+
+        # every pin shares the same material and geometry dicts
+        materials, geometry = self.breeder_materials, self.breeder_geometry
+        self.add_components(*(PinAssembly({"material": materials, "geometry": geometry, "origin": pin_pos}) for pin_pos in pin_origins))
         return pin_positions
 
-    def __fill_fw_width(self, distance_from_fw):
+    @functools.cached_property
+    def _fw_slope(self):
+        '''Horizontal offset of the first wall (FW) sides and horizontal width of its sidewalls.
+        Both only depend on the FW geometry so are computed once per assembly.
+
+        :return: offset, sidewall horizontal width
+        :rtype: (float, float)
+        '''
         fw_length = self.first_wall_geometry["length"]
-        fw_outer_width = self.first_wall_geometry["outer width"]
-        z_position = fw_length - (distance_from_fw + self.first_wall_geometry["thickness"])
-        offset = (fw_outer_width - self.first_wall_geometry["inner width"])/2
+        offset = (self.first_wall_geometry["outer width"] - self.first_wall_geometry["inner width"])/2
 
-        if offset == 0:
-            slope_angle = np.pi/2
-        elif offset > 0:
-            slope_angle = np.arctan(fw_length/offset)
-        else:
-            slope_angle = np.pi + np.arctan(fw_length/offset)
+        # the sidewalls slope at angle arctan(length/offset) in [0, pi) and
+        # 1/sin(arctan(r)) = sqrt(1 + 1/r^2), so no trig is needed
+        return offset, self.first_wall_geometry["sidewall thickness"] * math.hypot(fw_length, offset) / fw_length
+
+    @functools.cached_property
+    def _pin_inner_reach(self):
+        '''Distance from the first wall to the back of the breeder pins'''
+        bu_geometry = self.breeder_geometry
+        return bu_geometry["pressure tube thickness"] + bu_geometry["pressure tube gap"] + bu_geometry["inner length"]
 
-        fw_sidewall_horizontal = self.first_wall_geometry["sidewall thickness"] / np.sin(slope_angle)
+    @functools.cached_property
+    def _pin_outer_reach(self):
+        '''Distance from the first wall to the back of the breeder pin outer cladding'''
+        bu_geometry = self.breeder_geometry
+        return bu_geometry["pressure tube thickness"] + bu_geometry["pressure tube gap"] + bu_geometry["offset"] + bu_geometry["outer length"]
+
+    def __fill_fw_width(self, distance_from_fw):
+        fw_length = self.first_wall_geometry["length"]
+        offset, fw_sidewall_horizontal = self._fw_slope
+        z_position = fw_length - (distance_from_fw + self.first_wall_geometry["thickness"])
         position_fraction = z_position/fw_length
 
-        filled_width = fw_outer_width - 2*(position_fraction*offset + fw_sidewall_horizontal)
+        filled_width = self.first_wall_geometry["outer width"] - 2*(position_fraction*offset + fw_sidewall_horizontal)
 
         return filled_width
 
@@ -678,16 +799,12 @@ class HCPBBlanket(CreatedComponentAssembly):
         return self.__jsonify(parameters, backplate_start_z)
 
     def __get_rib_positions(self, z_position) -> list[Vertex]:
-        pin_spacing = self.geometry["pin spacing"]*np.sqrt(3/4)
-        horizontal_start = self.__get_pin_start_params()[1] - pin_spacing/2
+        pin_spacing = self.geometry["pin spacing"]*math.sqrt(3/4)
+        horizontal_start = self._pin_start_params[1] - pin_spacing/2
 
-        positions = []
         front_rib_positions = self.geometry["front rib positions"]
         front_rib_positions.sort()
-        for position_index in front_rib_positions:
-            positions.append(Vertex(horizontal_start + position_index*pin_spacing, 0, z_position))
-
-        return positions
+        return [Vertex(horizontal_start + position_index*pin_spacing, 0, z_position) for position_index in front_rib_positions]
 
     def __add_common_rib_params(self, params: dict):
         params["height"] = self.first_wall_geometry["height"]
@@ -702,39 +819,36 @@ class HCPBBlanket(CreatedComponentAssembly):
 
         params = self.front_ribs_geometry
         params = self.__add_common_rib_params(params)
-        params["length"] = bu_geometry["pressure tube thickness"] + bu_geometry["pressure tube gap"] + bu_geometry["inner length"] - bu_geometry["pressure tube length"]
+        params["length"] = self._pin_inner_reach - bu_geometry["pressure tube length"]
 
         z_position = self.first_wall_geometry["length"] - (self.first_wall_geometry["thickness"] + self.breeder_geometry["pressure tube length"])
         rib_positions = self.__get_rib_positions(z_position)
         return params, rib_positions
 
     def __get_back_ribs_params(self):
-        bu_geometry = self.breeder_geometry
+        fw_geometry = self.first_wall_geometry
 
         params = self.back_ribs_geometry
         params = self.__add_common_rib_params(params)
 
-        z_position = self.first_wall_geometry["length"] - (bu_geometry["pressure tube thickness"] + bu_geometry["pressure tube gap"] + bu_geometry["inner length"] + self.first_wall_geometry["thickness"])
+        z_position = fw_geometry["length"] - (self._pin_inner_reach + fw_geometry["thickness"])
         params["length"] = z_position - self.geometry["FW backplate thickness"]
         rib_positions = self.__get_rib_positions(z_position)
         return params, rib_positions
 
     def __sort_pin_positions(self, pin_positions):
         rib_pos = self.geometry["front rib positions"]
-        plate_hole_positions = [[] for i in range(len(rib_pos)+1)]
-
-        for row in pin_positions:
-            padded_rib_pos = [0] + rib_pos + [len(row)]
-            for i in range(len(padded_rib_pos)-1):
-                plate_hole_positions[i].append(row[padded_rib_pos[i]:padded_rib_pos[i+1]])
-        return plate_hole_positions
+        # every row of the lattice has the same number of slots
+        row_length = len(pin_positions[0]) if pin_positions else 0
+        bounds = [0, *rib_pos, row_length]
+        return [[row[start:stop] for row in pin_positions] for start, stop in zip(bounds, bounds[1:])]
 
     def __get_pg_front_plate_json(self):
         fw_geometry = self.first_wall_geometry
         bu_geometry = self.breeder_geometry
         parameters = self.__dict_with_height()
         parameters["thickness"] = self.geometry["PG front plate thickness"]
-        plate_distance_from_fw = bu_geometry["pressure tube thickness"] + bu_geometry["pressure tube gap"] + bu_geometry["offset"] + bu_geometry["outer length"] - parameters["thickness"]
+        plate_distance_from_fw = self._pin_outer_reach - parameters["thickness"]
         parameters["hole radius"] = bu_geometry["inner cladding"] + bu_geometry["outer cladding"] + bu_geometry["breeder chamber thickness"] + bu_geometry["coolant inlet radius"]
         parameters["length"], parameters["extension"] = self.__get_plate_length_and_ext(plate_distance_from_fw, parameters["thickness"])
 
@@ -747,7 +861,7 @@ class HCPBBlanket(CreatedComponentAssembly):
         parameters = self.__dict_with_height()
         parameters["thickness"] = self.geometry["PG mid plate thickness"]
         parameters["hole radius"] = bu_geometry["inner cladding"] + bu_geometry["coolant inlet radius"]
-        plate_distance_from_fw = bu_geometry["pressure tube thickness"] + bu_geometry["pressure tube gap"] + bu_geometry["offset"] + bu_geometry["outer length"] + self.geometry["PG mid plate gap"]
+        plate_distance_from_fw = self._pin_outer_reach + self.geometry["PG mid plate gap"]
         parameters["length"], parameters["extension"] = self.__get_plate_length_and_ext(plate_distance_from_fw, parameters["thickness"])
 
         start_z = fw_geometry["length"] - (fw_geometry["thickness"] + plate_distance_from_fw + parameters["thickness"])
@@ -758,7 +872,7 @@ class HCPBBlanket(CreatedComponentAssembly):
         bu_geometry = self.breeder_geometry
         parameters = self.__dict_with_height()
         parameters["thickness"] = self.geometry["PG back plate thickness"]
-        plate_distance_from_fw = bu_geometry["pressure tube thickness"] + bu_geometry["pressure tube gap"] + bu_geometry["inner length"] - parameters["thickness"]
+        plate_distance_from_fw = self._pin_inner_reach - parameters["thickness"]
         parameters["hole radius"] = bu_geometry["inner cladding"] + bu_geometry["coolant inlet radius"]
         parameters["length"], parameters["extension"] = self.__get_plate_length_and_ext(plate_distance_from_fw, parameters["thickness"])
 
@@ -766,17 +880,16 @@ class HCPBBlanket(CreatedComponentAssembly):
         return self.__jsonify(parameters, start_z)
 
     def __get_cop_json(self):
-        bu_geometry = self.breeder_geometry
+        fw_geometry = self.first_wall_geometry
         parameters = self.cop_geometry
         offset = self.geometry["coolant outlet plenum gap"]
-        parameters["height"] = self.first_wall_geometry["height"]
+        parameters["height"] = fw_geometry["height"]
 
-        start_z = self.first_wall_geometry["length"] - (bu_geometry["pressure tube thickness"] + bu_geometry["pressure tube gap"] + bu_geometry["inner length"] + self.first_wall_geometry["thickness"] + offset)
+        start_z = fw_geometry["length"] - (self._pin_inner_reach + fw_geometry["thickness"] + offset)
         return self.__jsonify(parameters, start_z)
 
     def __get_separator_plate_json(self):
-        bu_geometry = self.breeder_geometry
-        pg_backplate_distance = bu_geometry["pressure tube thickness"] + bu_geometry["pressure tube gap"] + bu_geometry["inner length"]
+        pg_backplate_distance = self._pin_inner_reach
         distance_from_fw = pg_backplate_distance + self.geometry["coolant outlet plenum gap"] + self.cop_geometry["length"] + self.geometry["separator plate gap"]
 
         parameters = self.__dict_with_height()
@@ -797,6 +910,60 @@ class HCPBBlanket(CreatedComponentAssembly):
         return parameters
 
 
+# how tree walks treat an object, see component_kind
+ASSEMBLY_KIND, COMPONENT_KIND, GEOMETRY_KIND, OTHER_KIND = range(4)
+_KIND_CACHE = {}
+
+
+def component_kind(component) -> int:
+    '''Classify an object found in an assembly tree.
+    The isinstance checks run once per concrete type, the result is cached.
+
+    Parameters
+    ----------
+    component : GenericComponentAssembly | ComponentBase | CubitInstance
+        Object to classify
+
+    Returns
+    -------
+    int
+        One of ASSEMBLY_KIND, COMPONENT_KIND, GEOMETRY_KIND, OTHER_KIND
+    '''
+    component_type = type(component)
+    kind = _KIND_CACHE.get(component_type)
+    if kind is None:
+        if isinstance(component, GenericComponentAssembly):
+            kind = ASSEMBLY_KIND
+        elif isinstance(component, ComponentBase):
+            kind = COMPONENT_KIND
+        elif isinstance(component, CubitInstance):
+            kind = GEOMETRY_KIND
+        else:
+            kind = OTHER_KIND
+        _KIND_CACHE[component_type] = kind
+    return kind
+
+
+@functools.lru_cache(maxsize=None)
+def get_constructor(classname: str):
+    '''Get the python class corresponding to a json classname
+
+    Parameters
+    ----------
+    classname : str
+        json classname
+
+    Returns
+    -------
+    type
+        python class
+    '''
+    try:
+        return globals()[CLASS_MAPPING[classname]]
+    except KeyError:
+        raise CubismError(f"Unrecognised json class: {classname}")
+
+
 def construct(json_object: dict, *args):
     '''Instantiate component in python and cubit
 
@@ -810,5 +977,5 @@ def construct(json_object: dict, *args):
     SimpleComponent | GenericComponentAssembly
         Instantiated python class
     '''
-    constructor = globals()[CLASS_MAPPING[json_object["class"]]]
+    constructor = get_constructor(json_object["class"])
     return constructor(json_object, *args)
@@ -23,11 +23,13 @@ from hypnos.geometry import (
     Line,
     blunt_corners,
     create_brick,
+    move,
     rotate,
     sweep_about,
     sweep_along
     )
 import numpy as np
+import math
 from abc import ABC, abstractmethod
 
 
@@ -42,15 +44,15 @@ class ComponentBase(ABC):
     def __init__(self, classname, params: dict):
         self._classname = classname
         self.identifier = classname
-        self.geometry = params["geometry"] if "geometry" in params.keys() else None
-        self.material = params["material"] if "material" in params.keys() else None
-        self.origin = Vertex(0)
-        if "origin" in params.keys():
-            origin = params["origin"]
-            if isinstance(origin, Vertex):
-                self.origin = origin
-            elif type(origin) is list:
-                self.origin = Vertex(*origin)
+        self.geometry = params.get("geometry")
+        self.material = params.get("material")
+        origin = params.get("origin")
+        if isinstance(origin, Vertex):
+            self.origin = origin
+        elif type(origin) is list:
+            self.origin = Vertex(*origin)
+        else:
+            self.origin = Vertex(0)
         self.check_sanity()
 
     @property
@@ -93,11 +95,9 @@ class ComponentBase(ABC):
 
     def move(self, vector: Vertex):
         if type(vector) is tuple:
-            for geom in self.get_geometries():
-                geom.move(vector)
+            move(self.get_geometries(), vector)
         elif isinstance(vector, Vertex):
-            for geom in self.get_geometries():
-                geom.move((vector.x, vector.y, vector.z))
+            move(self.get_geometries(), (vector.x, vector.y, vector.z))
 
     def rotate(self, angle: float, origin: Vertex = Vertex(0, 0, 0), axis: Vertex = Vertex(0, 0, 1)):
         '''Rotate geometries about a given axis
@@ -158,9 +158,7 @@ class SimpleComponent(ComponentBase):
         if isinstance(subcomponents, CubitInstance):
             self.subcomponents.append(subcomponents)
         elif type(subcomponents) is list:
-            for subcomponent in subcomponents:
-                if isinstance(subcomponent, CubitInstance):
-                    self.subcomponents.append(subcomponent)
+            self.subcomponents.extend(subcomponent for subcomponent in subcomponents if isinstance(subcomponent, CubitInstance))
 
     def as_bodies(self):
         '''Convert geometries to references to their owning bodies'''
@@ -269,8 +267,8 @@ class CladdingComponent(SimpleComponent):
         cladding_vertices[4] = cladding_vertices[3] + Vertex(outer_length)
         cladding_vertices[5] = cladding_vertices[3] + Vertex(outer_length, -outer_cladding)
 
-        cladding_vertices[6] = cladding_vertices[3] + Vertex(outer_cladding * np.tan(slope_angle/2), -outer_cladding)
-        cladding_vertices[7] = cladding_vertices[2] + Vertex(inner_cladding/np.tan(slope_angle) + outer_cladding/np.sin(slope_angle), inner_cladding)
+        cladding_vertices[6] = cladding_vertices[3] + Vertex(outer_cladding * math.tan(slope_angle/2), -outer_cladding)
+        cladding_vertices[7] = cladding_vertices[2] + Vertex(inner_cladding/math.tan(slope_angle) + outer_cladding/math.sin(slope_angle), inner_cladding)
 
         cladding_vertices[9] = cladding_vertices[0] + Vertex(-distance_to_step)
         cladding_vertices[8] = cladding_vertices[9] + Vertex(0, step_thickness)
@@ -438,7 +436,7 @@ class MultiplierComponent(SimpleComponent):
         super().__init__("multiplier", json_object)
 
     def check_sanity(self):
-        if self.geometry["side"] <= np.sqrt(4/3) * self.geometry["inner radius"]:
+        if self.geometry["side"] <= math.sqrt(4/3) * self.geometry["inner radius"]:
             raise ValueError("Multiplier side length not big enough to make multiplier around pressure tube")
 
     def make_geometry(self):
@@ -450,7 +448,7 @@ class MultiplierComponent(SimpleComponent):
         subtract_vol.move((0, 0, length/2))
 
         # hexagonal face
-        face_vertex_positions = [Vertex(side_length).rotate(i*np.pi/3) for i in range(6)]
+        face_vertex_positions = [Vertex(side_length).rotate(i*math.pi/3) for i in range(6)]
         face = make_surface(face_vertex_positions, [])
         hex_prism = sweep_along(face, Vertex(0, 0, length))
 
@@ -524,7 +522,7 @@ class FirstWallComponent(SimpleComponent):
 
         offset = (outer_width - inner_width)/2
         slope_angle = arctan(length, offset)
-        sidewall_horizontal = sidewall_thickness/np.sin(slope_angle)
+        sidewall_horizontal = sidewall_thickness/math.sin(slope_angle)
 
         # need less vertices when bluntness = 0 so treat as a special case
         vertices = list(np.zeros(8))
@@ -536,8 +534,8 @@ class FirstWallComponent(SimpleComponent):
         vertices[3] = vertices[0] + Vertex(outer_width)
         vertices[4] = vertices[3] + Vertex(-sidewall_horizontal)
 
-        vertices[5] = vertices[2] + Vertex(-sidewall_horizontal) + Vertex(thickness/np.tan(slope_angle), -thickness, 0)
-        vertices[6] = vertices[1] + Vertex(sidewall_horizontal) + Vertex(-thickness/np.tan(slope_angle), -thickness, 0)
+        vertices[5] = vertices[2] + Vertex(-sidewall_horizontal) + Vertex(thickness/math.tan(slope_angle), -thickness, 0)
+        vertices[6] = vertices[1] + Vertex(sidewall_horizontal) + Vertex(-thickness/math.tan(slope_angle), -thickness, 0)
         vertices[7] = vertices[0] + Vertex(sidewall_horizontal)
 
         channel_ref = self.make_channel_volume(vertices)
@@ -697,13 +695,13 @@ class PurgeGasPlate(SimpleComponent):
     def __make_side_plate_json(self, rib_index):
         total_length = self.geometry["length"]
         geometry = self.extract_parameters(["thickness", "height", "extension", "hole radius"])
-        geometry["length"] = (total_length/2 - np.abs(self.rib_pos[rib_index])) - self.rib_thickness/2
+        geometry["length"] = (total_length/2 - abs(self.rib_pos[rib_index])) - self.rib_thickness/2
         origin = Vertex((geometry["length"] - total_length)/2) if rib_index == 0 else Vertex((-geometry["length"] + total_length)/2)
         return {"geometry": geometry, "material": self.material, "origin": origin}
 
     def __make_mid_plate_json(self, left_rib_index):
         geometry = self.extract_parameters(["thickness", "height", "extension", "hole radius"])
-        geometry["length"] = np.abs(self.rib_pos[left_rib_index] - self.rib_pos[left_rib_index+1]) - self.rib_thickness
+        geometry["length"] = abs(self.rib_pos[left_rib_index] - self.rib_pos[left_rib_index+1]) - self.rib_thickness
         origin = Vertex((self.rib_pos[left_rib_index] + self.rib_pos[left_rib_index+1])/2)
         return {"geometry": geometry, "material": self.material, "origin": origin}
 
@@ -7,6 +7,13 @@ Global constants
 (c) Copyright UKAEA 2024
 '''
 
+import math
+
+# hexagonal pin tiling
+COS_30 = math.cos(math.pi/6)
+SIN_30 = math.sin(math.pi/6)
+
+
 # required components for assemblies to be generated
 HCPB_BLANKET_REQUIREMENTS = [
     "first_wall",
@@ -37,3 +44,13 @@ CLASS_MAPPING = {
     "blanket_ring": "BlanketRingAssembly",
     "HCPB_blanket": "HCPBBlanket"
 }
+
+
+# json component class -> {json key: HCPBBlanket attribute to store it as}
+HCPB_COMPONENT_ATTRIBUTES = {
+    "first_wall": {"geometry": "first_wall_geometry", "material": "first_wall_material"},
+    "pin": {"geometry": "breeder_geometry", "material": "breeder_materials"},
+    "front_rib": {"geometry": "front_ribs_geometry"},
+    "back_rib": {"geometry": "back_ribs_geometry"},
+    "coolant_outlet_plenum": {"geometry": "cop_geometry"}
+}
@@ -30,6 +30,17 @@ from hypnos.generic_classes import (
     )
 
 
+# entity type -> cubit function returning IDs of that type in a group
+GROUP_ENTITY_GETTERS = {
+    "surface": cubit.get_group_surfaces,
+    "volume": cubit.get_group_volumes,
+    "body": cubit.get_group_bodies,
+    "vertex": cubit.get_group_vertices,
+    "curve": cubit.get_group_curves,
+    "group": cubit.get_group_groups
+}
+
+
 def initialise_cubit():
     '''Initialise an instance of cubit'''
     cubit.init(['cubit', '-nojournal'])
@@ -163,14 +174,18 @@ def to_bodies(component_list: list[CubitInstance]) -> list[CubitInstance]:
         list of parent bodies
     '''
     bodies_list = []
+    body_ids = set()
     for component in component_list:
         if isinstance(component, CubitInstance):
+            # bodies are passed through without asking cubit
             if component.geometry_type == "body":
-                if component.cid not in [i.cid for i in bodies_list]:
+                if component.cid not in body_ids:
+                    body_ids.add(component.cid)
                     bodies_list.append(component)
             else:
                 owning_body_id = cubit.get_owning_body(component.geometry_type, component.cid)
-                if owning_body_id not in [i.cid for i in bodies_list]:
+                if owning_body_id not in body_ids:
+                    body_ids.add(owning_body_id)
                     bodies_list.append(CubitInstance(owning_body_id, "body"))
     return bodies_list
 
@@ -263,20 +278,11 @@ def get_entities_from_group(group_identifier: int | str, entity_type: str) -> li
         group_identifier = cubit.get_id_from_name(group_identifier)
         if group_identifier == 0:
             raise CubismError("could not find group corresponding to name")
-    if entity_type == "surface":
-        return list(cubit.get_group_surfaces(group_identifier))
-    elif entity_type == "volume":
-        return list(cubit.get_group_volumes(group_identifier))
-    elif entity_type == "body":
-        return list(cubit.get_group_bodies(group_identifier))
-    elif entity_type == "vertex":
-        return list(cubit.get_group_vertices(group_identifier))
-    elif entity_type == "curve":
-        return list(cubit.get_group_curves(group_identifier))
-    elif entity_type == "group":
-        return list(cubit.get_group_groups(group_identifier))
-    else:
+    try:
+        group_getter = GROUP_ENTITY_GETTERS[entity_type]
+    except KeyError:
         raise CubismError(f"Entity type {entity_type} not recognised")
+    return list(group_getter(group_identifier))
 
 
 def add_to_new_entity(entity_type: str, name: str, thing_type: str, things_to_add):
@@ -328,23 +334,24 @@ def subtract(subtract_from: list[CubitInstance], subtract: list[CubitInstance],
     list[CubitInstance]
         list of subtracted geometries
     '''
-    from_ids = {body.cid for body in to_bodies(subtract_from)}
-    subtract_from = [body.handle for body in to_bodies(subtract_from)]
+    from_bodies = to_bodies(subtract_from)
+    from_ids = {body.cid for body in from_bodies}
+    subtract_from = [body.handle for body in from_bodies]
     subtract = [body.handle for body in to_bodies(subtract)]
-    pre_ids = set(cubit.get_entities("body"))
+    # cubit IDs only increase, so anything above the last ID is new
+    pre_last_id = cubit.get_last_id("body")
     if destroy:
         cubit.subtract(subtract, subtract_from)
         post_ids = set(cubit.get_entities("body"))
 
         common_body_ids = post_ids.intersection(from_ids)
-        new_ids = post_ids.difference(pre_ids)
+        new_ids = {body_id for body_id in post_ids if body_id > pre_last_id}
 
         subtract_ids = list(common_body_ids.union(new_ids))
     else:
         cubit.subtract(subtract, subtract_from, keep_old_in=True)
-        post_ids = set(cubit.get_entities("body"))
-
-        subtract_ids = list(post_ids.difference(pre_ids))
+        # cubit may skip IDs, so only keep bodies that actually exist
+        subtract_ids = [body_id for body_id in cubit.get_entities("body") if body_id > pre_last_id]
     return [CubitInstance(sub_id, "body") for sub_id in subtract_ids]
 
 
@@ -366,7 +373,8 @@ def union(geometries: list[CubitInstance], destroy=True):
     as_vols = to_volumes(geometries)
     vol_ids = {vol.cid for vol in as_vols}
     vol_id_string = " ".join(str(vol_id) for vol_id in list(vol_ids))
-    pre_vols = set(cubit.get_entities("volume"))
+    # cubit IDs only increase, so anything above the last ID is new
+    pre_last_id = cubit.get_last_id("volume")
     if destroy:
         cmd(f"unite volume {vol_id_string}")
         # the created union may have a volume ID(s) from the set of
@@ -379,8 +387,9 @@ def union(geometries: list[CubitInstance], destroy=True):
         # since we keep all old volumes no extras here
         extra_vol = []
     # the created union may have a new volume ID(s)
-    created_vol = list(post_vols.difference(pre_vols)) + extra_vol
+    created_vol = [vol_id for vol_id in post_vols if vol_id > pre_last_id] + extra_vol
     return [CubitInstance(vol, "volume") for vol in created_vol]
 
+
 # unionise is in Assemblies.py as it needs to know about the
 # ComplexComponent and Assembly classes
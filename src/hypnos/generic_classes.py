@@ -10,6 +10,16 @@ Lowest level objects
 import cubit
 
 
+# geometry type -> cubit function returning a handle from an ID
+GEOMETRY_GETTERS = {
+    "body": cubit.body,
+    "volume": cubit.volume,
+    "surface": cubit.surface,
+    "curve": cubit.curve,
+    "vertex": cubit.vertex
+}
+
+
 # every cubit CL command should use this
 def cmd(command: str):
     '''Wrapper for cubit commands'''
@@ -40,6 +50,16 @@ class CubitInstance:
     def __str__(self) -> str:
         return f"{self.geometry_type} {self.cid}"
 
+    def get_geometries(self) -> list['CubitInstance']:
+        '''A geometry is its own only geometry, mirrors ComponentBase.get_geometries
+
+        Returns
+        -------
+        list[CubitInstance]
+            list containing this instance
+        '''
+        return [self]
+
     def destroy_cubit_instance(self):
         '''delete cubitside instance'''
         cmd(f"delete {self.geometry_type} {self.cid}")
@@ -97,18 +117,11 @@ def get_cubit_geometry(geometry_id: int, geometry_type: str):
     cubit.geom_entitiy
         corresponding cubit handle for the geometry
     '''
-    if geometry_type == "body":
-        return cubit.body(geometry_id)
-    elif geometry_type == "volume":
-        return cubit.volume(geometry_id)
-    elif geometry_type == "surface":
-        return cubit.surface(geometry_id)
-    elif geometry_type == "curve":
-        return cubit.curve(geometry_id)
-    elif geometry_type == "vertex":
-        return cubit.vertex(geometry_id)
-    else:
+    try:
+        geometry_getter = GEOMETRY_GETTERS[geometry_type]
+    except KeyError:
         raise CubismError(f"geometry type not recognised: {geometry_type}")
+    return geometry_getter(geometry_id)
 
 
 # raise this when bad things happen
@@ -14,6 +14,7 @@ make_cylinder_along: make cylinder along an cartesian axis
 make_loop: connect many vertices with curves
 hypotenuse: square of sum of roots
 arctan: arctan -> (0, pi)
+hexagonal_lattice: pin positions in a hexagonal tiling
 make_surface: make surface from bounding vertices
 blunt_corner: split vertex into two
 fetch: get vertices from list of length 3
@@ -22,6 +23,7 @@ blunt_corners: blunt many corners simultaneously
 convert_to_3d_vector: opinionated conversion to list of length 3
 create_brick: create a cuboid
 make_brick_from_geom: create_brick from parameter dict
+move: translate geometries by a vector
 rotate: rotate a geometry about any axis
 sweep_about: sweep a surface about an axis
 sweep_along: sweep a surface along a vector
@@ -35,7 +37,9 @@ Line: Representation of a line in point-slope form
 '''
 from hypnos.generic_classes import CubitInstance, CubismError, cmd
 from hypnos.cubit_functions import get_id_string, cmd_geom, get_last_geometry
+from hypnos.constants import COS_30, SIN_30
 import numpy as np
+import math
 
 
 def create_2d_vertex(x: float, y: float):
@@ -215,14 +219,48 @@ def arctan(opposite: float, adjacent: float):
         arctan(opposite/adjacent)
     '''
     if adjacent == 0:
-        arctan_angle = np.pi/2
+        arctan_angle = math.pi/2
     elif adjacent > 0:
-        arctan_angle = np.arctan(opposite / adjacent)
+        arctan_angle = math.atan(opposite / adjacent)
     else:
-        arctan_angle = np.pi + np.arctan(opposite / adjacent)
+        arctan_angle = math.pi + math.atan(opposite / adjacent)
     return arctan_angle
 
 
+def hexagonal_lattice(row_pins: int, columns_indices: int, pin_spacing: float, horizontal_start: float, vertical_start: float, distinct_heights: int):
+    '''Positions of pins tiled hexagonally.
+    Pins zig-zag along a row, alternating between the 2 heights
+    belonging to a column index. Pure numpy, no cubit calls.
+
+    Parameters
+    ----------
+    row_pins : int
+        number of pins along a row
+    columns_indices : int
+        number of column indices (each spans 2 pin heights)
+    pin_spacing : float
+        distance between neighbouring pins
+    horizontal_start : float
+        x-coordinate of the first pin in a row
+    vertical_start : float
+        y-coordinate of the first pin in the first row
+    distinct_heights : int
+        number of distinct heights pins fit at
+
+    Returns
+    -------
+    tuple[np.ndarray, np.ndarray, np.ndarray]
+        x-coordinates, y-coordinates, and whether the pin fits,
+        each of shape (columns_indices, row_pins)
+    '''
+    row_index, column_index = np.meshgrid(np.arange(row_pins), np.arange(columns_indices))
+    x = horizontal_start + row_index*pin_spacing*COS_30
+    y = vertical_start - column_index*pin_spacing - (row_index % 2)*pin_spacing*SIN_30
+    # stop tiling if we overshoot the number of column pins (each column index corresponds to 2 column pins)
+    fits = (column_index*2)+1 + (row_index % 2) <= distinct_heights
+    return x, y, fits
+
+
 class Vertex():
     '''Representation of a vertex. Attributes are 3D coordinates.'''
     def __init__(self, x: int, y=0, z=0) -> None:
@@ -319,9 +357,12 @@ class Vertex():
         Vertex
             rotated vertex
         '''
-        x_rotated = (self.x*np.cos(z)*np.cos(y)) + (self.y*(np.cos(z)*np.sin(y)*np.sin(x) - np.sin(z)*np.cos(x))) + (self.z*(np.cos(z)*np.sin(y)*np.cos(x) + np.sin(z)*np.sin(x)))
-        y_rotated = (self.x*np.sin(z)*np.cos(y)) + (self.y*(np.sin(z)*np.sin(y)*np.sin(x) + np.cos(z)*np.cos(x))) + (self.z*(np.sin(z)*np.sin(y)*np.cos(x) - np.cos(z)*np.sin(x)))
-        z_rotated = (-self.z*np.sin(y)) + (self.y*np.cos(y)*np.sin(x)) + (self.z*np.cos(y)*np.cos(x))
+        cos_z, sin_z = math.cos(z), math.sin(z)
+        cos_y, sin_y = math.cos(y), math.sin(y)
+        cos_x, sin_x = math.cos(x), math.sin(x)
+        x_rotated = (self.x*cos_z*cos_y) + (self.y*(cos_z*sin_y*sin_x - sin_z*cos_x)) + (self.z*(cos_z*sin_y*cos_x + sin_z*sin_x))
+        y_rotated = (self.x*sin_z*cos_y) + (self.y*(sin_z*sin_y*sin_x + cos_z*cos_x)) + (self.z*(sin_z*sin_y*cos_x - cos_z*sin_x))
+        z_rotated = (-self.z*sin_y) + (self.y*cos_y*sin_x) + (self.z*cos_y*cos_x)
         return Vertex(x_rotated, y_rotated, z_rotated)
 
     def distance(self):
@@ -737,6 +778,26 @@ def make_brick_from_geom(geometry: dict) -> CubitInstance:
     return brick
 
 
+def move(geoms: list[CubitInstance], vector: tuple):
+    '''Translate geometries by a vector
+
+        Parameters
+        ----------
+        geoms : list[CubitInstance]
+            geometries to move
+        vector : tuple
+            tuple of length 3, coordinates to translate by in 3D space
+        '''
+    if isinstance(geoms, CubitInstance):
+        geoms = [geoms]
+    # one command per geometry type rather than per geometry
+    geoms_by_type = {}
+    for geom in geoms:
+        geoms_by_type.setdefault(geom.geometry_type, []).append(geom)
+    for geometry_type, typed_geoms in geoms_by_type.items():
+        cmd(f"{geometry_type} {get_id_string(typed_geoms)} move {vector[0]} {vector[1]} {vector[2]}")
+
+
 def rotate(geoms: list[CubitInstance], angle: float, origin: Vertex = Vertex(0, 0, 0), axis: Vertex = Vertex(0, 0, 1)):
     '''Rotate geometries about a given axis
 
@@ -751,8 +812,12 @@ def rotate(geoms: list[CubitInstance], angle: float, origin: Vertex = Vertex(0,
         '''
     if isinstance(geoms, CubitInstance):
         geoms = [geoms]
+    # one command per geometry type rather than per geometry
+    geoms_by_type = {}
     for geom in geoms:
-        cmd(f"rotate {geom} about origin {str(origin)} direction {str(axis)} angle {angle}")
+        geoms_by_type.setdefault(geom.geometry_type, []).append(geom)
+    for geometry_type, typed_geoms in geoms_by_type.items():
+        cmd(f"rotate {geometry_type} {get_id_string(typed_geoms)} about origin {str(origin)} direction {str(axis)} angle {angle}")
 
 
 def sweep_about(surf: CubitInstance, angle=360, vec=Vertex(1), point=Vertex(0)) -> CubitInstance:
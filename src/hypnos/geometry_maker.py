@@ -148,8 +148,10 @@ class GeometryMaker():
         for param_path, updated_value in updated_params.items():
             if type(param_path) is not str:
                 raise CubismError(f"path should be given as a string: {str(param_path)}")
-            key_route = param_path.split(self.key_route_delimiter)
-            self.design_tree = self.__build_param_dict(key_route, self.design_tree, updated_value)
+            *parent_route, key = param_path.split(self.key_route_delimiter)
+            param_dict = self.__follow_key_route(parent_route, self.design_tree)
+            self.__check_key(param_dict, key)
+            param_dict[key] = updated_value
 
     def get_param(self, param_path: str):
         r'''Get parameter in stored design tree.
@@ -178,20 +180,15 @@ class GeometryMaker():
         return self.__follow_key_route(key_route, self.design_tree)
 
     def __follow_key_route(self, key_route: list[str], param_dict: dict):
-        if key_route[0] not in param_dict.keys():
-            raise CubismError("Path given does not correspond to existing parameters")
-        if len(key_route) == 1:
-            return param_dict[key_route[0]]
-        return self.__follow_key_route(key_route[1:], param_dict[key_route[0]])
-
-    def __build_param_dict(self, key_route: list, param_dict: dict, updated_value):
-        if len(key_route) == 0:
-            return updated_value
-        if key_route[0] not in param_dict.keys():
-            raise CubismError("Path given does not correspond to existing parameters")
-        param_dict[key_route[0]] = self.__build_param_dict(key_route[1:], param_dict[key_route[0]], updated_value)
+        for key in key_route:
+            self.__check_key(param_dict, key)
+            param_dict = param_dict[key]
         return param_dict
 
+    def __check_key(self, param_dict: dict, key: str):
+        if not isinstance(param_dict, dict) or key not in param_dict:
+            raise CubismError("Path given does not correspond to existing parameters")
+
     @log_method("Making geometry")
     def make_geometry(self):
         '''Build geometry corresponding to design tree in cubit
@@ -14,20 +14,27 @@ from hypnos.generic_classes import (
 )
 from hypnos.geometry import (
     convert_to_3d_vector,
-    create_brick
+    create_brick,
+    hexagonal_lattice,
+    Vertex
 )
-from hypnos.components import SimpleComponent
+from hypnos.components import SimpleComponent, ExternalComponent, FirstWallComponent
+from hypnos.cubit_functions import to_volumes, to_bodies, get_id_string
+from hypnos.constants import COS_30, SIN_30
 from hypnos.assemblies import (
     CreatedComponentAssembly,
-    ExternalComponentAssembly
+    ExternalComponentAssembly,
+    PinAssembly
 )
+import functools
+import math
 
 # constants
 NEUTRON_TEST_FACILITY_REQUIREMENTS = ["room", "source"]
 BLANKET_REQUIREMENTS = ["breeder", "structure"]
 ROOM_REQUIREMENTS = ["blanket", "surrounding_walls"]
 BLANKET_SHELL_REQUIREMENTS = ["first_wall", "pin"]
-FACILITY_MORPHOLOGIES = ["exclusive", "inclusive", "overlap", "wall"]
+FACILITY_MORPHOLOGIES = frozenset({"exclusive", "inclusive", "overlap", "wall"})
 
 
 # Simple components
@@ -100,10 +107,10 @@ class WallComponent(SimpleComponent):
         # wall
         geom = self.geometry
         thickness = geom["wall thickness"]
-        plane = geom["wall plane"] if "wall plane" in geom.keys() else "x"
-        pos = geom["wall position"] if "wall position" in geom.keys() else 0
+        plane = geom.get("wall plane", "x")
+        pos = geom.get("wall position", 0)
         # hole
-        hole_pos = geom["wall hole position"] if "wall hole position" in geom.keys() else [0, 0]
+        hole_pos = geom.get("wall hole position", [0, 0])
         hole_radius = geom["wall hole radius"]
         # wall fills room
         room_dims = convert_to_3d_vector(geom["dimensions"])
@@ -159,6 +166,16 @@ class NeutronTestFacility(CreatedComponentAssembly):
         super().__init__("NTF", NEUTRON_TEST_FACILITY_REQUIREMENTS, json_object)
         # this defines what morphology will be enforced later
         self.morphology = json_object["morphology"]
+        # the component tree is fixed from here on, so look these up once
+        partitions = self.partition_components_by_class((RoomAssembly, SurroundingWallsComponent, SourceAssembly))
+        self._rooms = partitions[RoomAssembly]
+        self._surrounding_walls = partitions[SurroundingWallsComponent]
+        self._sources = partitions[SourceAssembly]
+        self._blankets = []
+        for room in self._rooms:
+            self._blankets += room.get_components_of_class(BlanketAssembly)
+        # shared by morphology enforcement and application
+        self._source_blanket_overlaps = None
         self.enforce_facility_morphology()
         self.apply_facility_morphology()
         self.validate_rooms_and_fix_air()
@@ -175,12 +192,18 @@ class NeutronTestFacility(CreatedComponentAssembly):
         if self.morphology not in FACILITY_MORPHOLOGIES:
             raise CubismError(f"Morphology not supported by this facility: {self.morphology}")
 
+        # without any source/blanket overlaps the outcome is known without unions
+        if not self.__get_source_blanket_overlaps():
+            if self.morphology == "inclusive":
+                raise CubismError("Source not completely enclosed")
+            elif self.morphology == "overlap":
+                raise CubismError("Source and blanket not partially overlapping")
+            print(f"{self.morphology} morphology enforced")
+            return
+
         # Get the net source, blanket, and the union of both
-        source_object = unionise(self.get_components_of_class(SourceAssembly))
-        blanket_components = []
-        for i in self.get_components_of_class(RoomAssembly):
-            blanket_components += i.get_components_of_class(BlanketAssembly) 
-        blanket_object = unionise(blanket_components)
+        source_object = unionise(self._sources)
+        blanket_object = unionise(self._blankets)
         union_object = unionise([source_object, blanket_object])
 
         # get their volumes
@@ -194,11 +217,11 @@ class NeutronTestFacility(CreatedComponentAssembly):
         union_object.destroy_cubit_instance()
 
         # different enforcing depending on the morphology specified
-        if (self.morphology == "inclusive") & (not (union_volume == blanket_volume)):
+        if self.morphology == "inclusive" and union_volume != blanket_volume:
             raise CubismError("Source not completely enclosed")
-        elif (self.morphology == "exclusive") & (not (union_volume == blanket_volume + source_volume)):
+        elif self.morphology == "exclusive" and union_volume != blanket_volume + source_volume:
             raise CubismError("Source not completely outside blanket")
-        elif (self.morphology == "overlap") & (not (union_volume < blanket_volume + source_volume)):
+        elif self.morphology == "overlap" and not union_volume < blanket_volume + source_volume:
             raise CubismError("Source and blanket not partially overlapping")
         else:
             print(f"{self.morphology} morphology enforced")
@@ -207,28 +230,48 @@ class NeutronTestFacility(CreatedComponentAssembly):
         '''If the morphology is inclusive/overlap,
         remove the parts of the blanket inside the neutron source'''
         if self.morphology in ["inclusive", "overlap"]:
-            # convert everything to volumes in case of stray bodies
-            source_volumes = to_volumes(self.get_geometries_from([SourceAssembly, ExternalComponent]))
-            blanket_volumes = []
-            for room in self.get_components_of_class(RoomAssembly):
-                for blanket in room.get_components_of_class(BlanketAssembly):
-                    blanket_volumes += to_volumes(blanket.get_all_geometries())
-            # if there is an overlap, remove it
-            for source_volume in source_volumes:
-                for blanket_volume in blanket_volumes:
-                    if isinstance(source_volume, CubitInstance) and isinstance(blanket_volume, CubitInstance):
-                        if not (cubit.get_overlapping_volumes([source_volume.cid, blanket_volume.cid]) == ()):
-                            # i have given up on my python api dreams. we all return to cubit ccl in the end.
-                            cmd(f"remove overlap volume {source_volume.cid} {blanket_volume.cid} modify volume {blanket_volume.cid}")
+            # if there is an overlap between a source and blanket, remove it.
+            # remove overlap takes exactly two volumes, so one command per pair
+            for source_id, blanket_id in self.__get_source_blanket_overlaps():
+                # i have given up on my python api dreams. we all return to cubit ccl in the end.
+                cmd(f"remove overlap volume {source_id} {blanket_id} modify volume {blanket_id}")
+            self._source_blanket_overlaps = None
             print(f"{self.morphology} morphology applied")
 
+    def __get_source_blanket_overlaps(self) -> list[tuple[int, int]]:
+        '''Find every pair of overlapping source and blanket volumes.
+        Cached until the overlaps are removed.
+
+        :return: (source volume ID, blanket volume ID) pairs
+        :rtype: list[tuple[int, int]]
+        '''
+        if self._source_blanket_overlaps is not None:
+            return self._source_blanket_overlaps
+        # convert everything to volumes in case of stray bodies
+        source_volumes = to_volumes(self.get_geometries_from([SourceAssembly, ExternalComponent]))
+        blanket_volumes = []
+        for blanket in self._blankets:
+            blanket_volumes += to_volumes(blanket.get_geometries())
+        source_ids = {vol.cid for vol in source_volumes if isinstance(vol, CubitInstance)}
+        blanket_ids = {vol.cid for vol in blanket_volumes if isinstance(vol, CubitInstance)}
+        # query every overlap at once, these come back as a flat list of pairs
+        overlaps = cubit.get_overlapping_volumes(list(source_ids) + list(blanket_ids))
+        pairs = []
+        for vol_a, vol_b in zip(overlaps[::2], overlaps[1::2]):
+            if vol_a in blanket_ids and vol_b in source_ids:
+                vol_a, vol_b = vol_b, vol_a
+            if vol_a in source_ids and vol_b in blanket_ids:
+                pairs.append((vol_a, vol_b))
+        self._source_blanket_overlaps = pairs
+        return pairs
+
     def validate_rooms_and_fix_air(self):
         '''Subtract all non-air geometries from all air geometries. 
         Validate that everything is inside a room'''
 
         # collect geometries that define the complete space of the facility
         room_bounding_boxes = []
-        for room in self.get_components_of_class(RoomAssembly):
+        for room in self._rooms:
             # get all air (it is set up to be overlapping with the surrounding walls at this stage)
             for surrounding_walls in room.get_components_of_class(SurroundingWallsComponent):
                 room_bounding_boxes += surrounding_walls.get_air_subcomponents()
@@ -239,8 +282,9 @@ class NeutronTestFacility(CreatedComponentAssembly):
         # get a union defining the 'bounding boxes' for all rooms,
         # and a union of every geometry in the facility.
         # as well as the union of those two unions
+        facility_geometries = self.get_geometries()
         room_bounding_box = unionise(room_bounding_boxes)
-        all_geometries = unionise(self.get_all_geometries())
+        all_geometries = unionise(facility_geometries)
         union_object = unionise([room_bounding_box, all_geometries])
 
         # get volumes
@@ -255,23 +299,25 @@ class NeutronTestFacility(CreatedComponentAssembly):
         # the volume of their union with the room will be greater
         # than the volume of the room
         if union_volume > bounding_volume:
+            all_geometries.destroy_cubit_instance()
             raise CubismError("Everything not inside a room!")
 
-        # there is probably a better way of doing this
         # if a room is filled with air, subtract the union of all
-        # non-air geometries from it
-        for surrounding_walls in self.get_components_of_class(SurroundingWallsComponent):
+        # non-air geometries from it. keeping the union as the tool lets
+        # one command cut it out of every air region of the same type
+        air_by_type = {}
+        for surrounding_walls in self._surrounding_walls:
             if surrounding_walls.is_air():
                 for air in surrounding_walls.get_air_subcomponents():
-                    all_geometries_copy = all_geometries.copy()
-                    cmd(f'subtract {all_geometries_copy.geometry_type} {all_geometries_copy.cid} from {air.geometry_type} {air.cid}')
-        # cleanup
+                    air_by_type.setdefault(air.geometry_type, []).append(air)
+        for geometry_type, air_list in air_by_type.items():
+            cmd(f'subtract {all_geometries.geometry_type} {all_geometries.cid} from {geometry_type} {get_id_string(air_list)} keep_tool')
         all_geometries.destroy_cubit_instance()
 
     # this is just ridiculous. like actually why.
     def change_air_to_volumes(self):
         '''Components referring to air now only contain volumes'''
-        for surrounding_walls in self.get_components_of_class(SurroundingWallsComponent):
+        for surrounding_walls in self._surrounding_walls:
             surrounding_walls.air_as_volumes()
 
 
@@ -290,12 +336,9 @@ class RoomAssembly(CreatedComponentAssembly):
         component_list = list(json_object["components"].values())
 
         # Take out any walls from component list
-        json_walls = []
-        for json_component in component_list:
-            if json_component["class"] == "wall":
-                json_walls.append(json_component)
-                component_list.remove(json_component)
-        json_object["components"] = component_list
+        json_walls = [json_comp for json_comp in component_list if json_comp["class"] == "wall"]
+        # shallow copy so the caller's json keeps its walls
+        json_object = dict(json_object, components=[json_comp for json_comp in component_list if json_comp["class"] != "wall"])
 
         # set up rest of components
         super().__init__("Room", ROOM_REQUIREMENTS, json_object)
@@ -304,18 +347,25 @@ class RoomAssembly(CreatedComponentAssembly):
     def setup_walls(self, json_walls):
         '''Set up walls in surrounding walls. Remove air from walls'''
         for surrounding_walls in self.get_components_of_class(SurroundingWallsComponent):
-            for json_wall in json_walls:
-                # make wall
-                wall_geometry = surrounding_walls.geometry
-                wall_material = json_wall["material"] if "material" in json_wall.keys() else surrounding_walls.material
-                for wall_key in json_wall["geometry"].keys():
-                    wall_geometry["wall " + wall_key] = json_wall["geometry"][wall_key]
-                self.components.append(WallComponent({"geometry": wall_geometry, "material": wall_material}))
-                # remove air
+            air_by_type = {}
+            if surrounding_walls.is_air():
                 for air in surrounding_walls.get_air_subcomponents():
-                    temp_wall = WallComponent({"geometry": wall_geometry, "material": wall_material})
-                    for t_w in temp_wall.get_geometries():
-                        cmd(f"subtract {t_w.geometry_type} {t_w.cid} from {air.geometry_type} {air.cid}")
+                    air_by_type.setdefault(air.geometry_type, []).append(air)
+            for json_wall in json_walls:
+                # make wall. copy the room geometry so walls don't leak into each other
+                wall_geometry = dict(surrounding_walls.geometry)
+                wall_geometry.update({f"wall {wall_key}": value for wall_key, value in json_wall["geometry"].items()})
+                wall_material = json_wall.get("material", surrounding_walls.material)
+                wall = WallComponent({"geometry": wall_geometry, "material": wall_material})
+                self.add_components(wall)
+                # remove air, keeping the wall we just made as the tool.
+                # one command per pair of wall and air geometry types
+                wall_by_type = {}
+                for w in wall.get_geometries():
+                    wall_by_type.setdefault(w.geometry_type, []).append(w)
+                for wall_type, wall_geometries in wall_by_type.items():
+                    for air_type, air_list in air_by_type.items():
+                        cmd(f"subtract {wall_type} {get_id_string(wall_geometries)} from {air_type} {get_id_string(air_list)} keep_tool")
 
 
 # in case we need to do source-specific actions
@@ -334,13 +384,14 @@ class BlanketShellAssembly(CreatedComponentAssembly):
 
     def setup_assembly(self):
         for component in self.component_list:
-            if component["class"] == "first_wall":
-                first_wall_object = component
-                first_wall_geometry = first_wall_object["geometry"]
-            elif component["class"] == "pin":
-                breeder_materials = component["material"]
-                breeder_geometry = component["geometry"]
-                multiplier_side = breeder_geometry["multiplier side"]
+            match component["class"]:
+                case "first_wall":
+                    first_wall_object = component
+                    first_wall_geometry = first_wall_object["geometry"]
+                case "pin":
+                    breeder_materials = component["material"]
+                    breeder_geometry = component["geometry"]
+                    multiplier_side = breeder_geometry["multiplier side"]
 
         vertical_offset = self.geometry["vertical offset"]
         horizontal_offset = self.geometry["horizontal offset"]
@@ -356,24 +407,23 @@ class BlanketShellAssembly(CreatedComponentAssembly):
         accessible_height = height - 2*vertical_offset
         # hexagonally tiled breeder units are broken up into 'rows' and 'columns'
         # number of pins that will fit in a 'row'
-        row_pins = int((accessible_width - 2*multiplier_side) // (pin_spacing * np.cos(np.pi/6))) + 1
-        horizontal_start_pos = -(row_pins-1)*pin_spacing*np.cos(np.pi/6) / 2
+        row_pins = int((accessible_width - 2*multiplier_side) // (pin_spacing * COS_30)) + 1
+        horizontal_start_pos = -(row_pins-1)*pin_spacing*COS_30 / 2
         # each column 'index' has breeder units at 2 different heights
-        columns_indices = int((accessible_height - 2*multiplier_side*np.cos(np.pi/6)) // pin_spacing) + 1
+        columns_indices = int((accessible_height - 2*multiplier_side*COS_30) // pin_spacing) + 1
         # number of distinct heights we can place breeder units
-        distinct_pin_heights = int((accessible_height - 2*multiplier_side*np.cos(np.pi/6)) // (pin_spacing*np.sin(np.pi/6))) + 1
-        centering_vertical_offset = ((accessible_height- 2*multiplier_side*np.cos(np.pi/6)) - (distinct_pin_heights-1)*pin_spacing*np.sin(np.pi/6)) / 2
-        vertical_start_pos = height - (vertical_offset + centering_vertical_offset + multiplier_side*np.cos(np.pi/6))
+        distinct_pin_heights = int((accessible_height - 2*multiplier_side*COS_30) // (pin_spacing*SIN_30)) + 1
+        centering_vertical_offset = ((accessible_height- 2*multiplier_side*COS_30) - (distinct_pin_heights-1)*pin_spacing*SIN_30) / 2
+        vertical_start_pos = height - (vertical_offset + centering_vertical_offset + multiplier_side*COS_30)
+
+        pin_x, pin_y, fits = hexagonal_lattice(row_pins, columns_indices, pin_spacing, horizontal_start_pos, vertical_start_pos, distinct_pin_heights)
+        pin_x, pin_y = pin_x[fits], pin_y[fits]
+        pin_z = length - wall_thickness
 
-        for j in range(columns_indices):
-            pin_pos = Vertex(horizontal_start_pos , vertical_start_pos, length-wall_thickness) + Vertex(0, -pin_spacing*j)
-            for i in range(row_pins):
-                # stop tiling if we overshoot the number of column pins (each column index corresponds to 2 column pins)
-                if (j*2)+1 + (i%2) <= distinct_pin_heights:
-                    self.components.append(PinAssembly({"material":breeder_materials, "geometry":breeder_geometry, "origin":pin_pos}))
-                pin_pos = pin_pos + Vertex(pin_spacing).rotate(((-1)**(i+1))*np.pi/6)
+        for x, y in zip(pin_x.tolist(), pin_y.tolist()):
+            self.add_components(PinAssembly({"material":breeder_materials, "geometry":breeder_geometry, "origin":Vertex(x, y, pin_z)}))
 
-        self.components.append(FirstWallComponent(first_wall_object))
+        self.add_components(FirstWallComponent(first_wall_object))
 
 
 class BlanketRingAssembly(CreatedComponentAssembly):
@@ -383,47 +433,58 @@ class BlanketRingAssembly(CreatedComponentAssembly):
         super().__init__("blanket_ring", ["blanket shell"], json_object)
 
     def setup_assembly(self):
-        blanket_shell, min_radius, blanket_segment, blanket_length, ring_thickness = self.__get_data()
+        blanket_shell, min_radius, blanket_segment, blanket_length, ring_thickness = self._ring_data
         radius = self.__tweak_radius(blanket_segment, min_radius)
         midpoint_vertices, angle_subtended = self.__get_segment_midpoints(radius, blanket_segment, blanket_length)
         for i in range(len(midpoint_vertices)):
             blanket_shell["origin"] = midpoint_vertices[i]+Vertex(0, -blanket_segment/2)
             blanket = BlanketShellAssembly(blanket_shell)
             blanket.rotate(-90, "origin", Vertex(0, 1, 0))
-            blanket.rotate(180*(angle_subtended*i)/np.pi, midpoint_vertices[i])
-            self.components.append(blanket)
+            blanket.rotate(math.degrees(angle_subtended*i), midpoint_vertices[i])
+            self.add_components(blanket)
 
     def __tweak_radius(self, blanket_segment, min_radius):
-        angle_subtended = 2*np.arcsin(blanket_segment/(2*min_radius))
-        if not 2*np.pi % angle_subtended == 0:
-            segments_needed = int(2*np.pi // angle_subtended) + 1
-            angle_needed = 2*np.pi / segments_needed
-            radius = blanket_segment / (2*np.sin(angle_needed/2))
+        angle_subtended = 2*math.asin(blanket_segment/(2*min_radius))
+        if not 2*math.pi % angle_subtended == 0:
+            segments_needed = int(2*math.pi // angle_subtended) + 1
+            angle_needed = 2*math.pi / segments_needed
+            radius = blanket_segment / (2*math.sin(angle_needed/2))
             return radius
         else:
             return min_radius
 
-    def __get_data(self):
+    @functools.cached_property
+    def _ring_data(self):
+        '''Blanket shell json and ring dimensions, read from the json once'''
         geometry = self.geometry
         min_radius = geometry["minimum radius"]
-        blanket_shell = {}
-        for component in self.component_list:
-            if component["class"] == "blanket shell":
-                blanket_shell["geometry"] = component["geometry"]
-                blanket_shell["components"] = component["components"]
-                for subcomponent in blanket_shell["components"]:
-                    if subcomponent["class"] == "first wall":
-                        sub_geometry = subcomponent["geometry"]
-                        blanket_segment = sub_geometry["height"]
-                        blanket_length = sub_geometry["length"]
-                        ring_thickness = sub_geometry["inner width"]
-        return blanket_shell, min_radius, blanket_segment, blanket_length, ring_thickness
+        # stop at the first match rather than scanning every component
+        shell_json = next((component for component in self.component_list if component["class"] == "blanket shell"), None)
+        if shell_json is None:
+            raise CubismError("Blanket ring needs a blanket shell component")
+        blanket_shell = {"geometry": shell_json["geometry"], "components": shell_json["components"]}
+        first_wall = next((subcomponent for subcomponent in blanket_shell["components"] if subcomponent["class"] == "first wall"), None)
+        if first_wall is None:
+            raise CubismError("Blanket shell needs a first wall component")
+        sub_geometry = first_wall["geometry"]
+        return blanket_shell, min_radius, sub_geometry["height"], sub_geometry["length"], sub_geometry["inner width"]
 
     def __get_segment_midpoints(self, radius, blanket_segment, blanket_length):
-        angle_subtended = 2*np.arcsin(blanket_segment/(2*radius))
-        segments_needed = int(2*np.pi/angle_subtended)
-        midpoint_vertex = Vertex(radius*np.cos(angle_subtended/2) + blanket_length)
-        midpoint_vertices = [midpoint_vertex.rotate(angle_subtended*i) for i in range(segments_needed)]
+        angle_subtended = 2*math.asin(blanket_segment/(2*radius))
+        segments_needed = int(2*math.pi/angle_subtended)
+        midpoint_distance = radius*math.cos(angle_subtended/2) + blanket_length
+        # step the first midpoint round the z-axis using the angle addition
+        # formulae, so only one sin/cos pair is ever evaluated
+        step_cos, step_sin = math.cos(angle_subtended), math.sin(angle_subtended)
+        cos_angle, sin_angle = 1.0, 0.0
+        midpoint_vertices = []
+        for i in range(segments_needed):
+            midpoint_vertices.append(Vertex(midpoint_distance*cos_angle, midpoint_distance*sin_angle))
+            cos_angle, sin_angle = cos_angle*step_cos - sin_angle*step_sin, sin_angle*step_cos + cos_angle*step_sin
+            # renormalise now and then so rounding errors don't build up
+            if i % 32 == 31:
+                norm = math.hypot(cos_angle, sin_angle)
+                cos_angle, sin_angle = cos_angle/norm, sin_angle/norm
         return midpoint_vertices, angle_subtended
 
 
@@ -442,6 +503,10 @@ def unionise(component_list: list):
     # get all CubitInstances from components
     instances_to_union = get_all_geometries_from_components(component_list)
 
+    # nothing to unite, skip the body lookup
+    if len(instances_to_union) == 1:
+        return instances_to_union[0].copy()
+
     # convert to bodies :(
     instances_to_union = to_bodies(instances_to_union)
 
@@ -454,16 +519,16 @@ def unionise(component_list: list):
     # get cubit handles
     instances_to_union = [i.handle for i in instances_to_union]
 
-    # need old and new volumes to check what the union creates
-    old_volumes = cubit.get_entities("volume")
-    old_bodies = cubit.get_entities("body")
+    # cubit IDs only increase, so compare last IDs to see what the union creates
+    old_volume_id = cubit.get_last_id("volume")
+    old_body_id = cubit.get_last_id("body")
     cubit.unite(instances_to_union, keep_old_in=True)
-    new_volumes = cubit.get_entities("volume")
-    new_bodies = cubit.get_entities("body")
-    if len(new_bodies) == len(old_bodies) + 1:
-        return CubitInstance(cubit.get_last_id("body"), "body")
-    elif len(new_volumes) == len(old_volumes) + 1:
-        return CubitInstance(cubit.get_last_id("volume"), "volume")
+    new_volume_id = cubit.get_last_id("volume")
+    new_body_id = cubit.get_last_id("body")
+    if new_body_id > old_body_id:
+        return CubitInstance(new_body_id, "body")
+    elif new_volume_id > old_volume_id:
+        return CubitInstance(new_volume_id, "volume")
     else:
         raise CubismError("Something unknowable was created in this union. Or worse, a surface.")
 
@@ -478,10 +543,8 @@ def get_all_geometries_from_components(component_list) -> list[CubitInstance]:
     '''
     instances = []
     for component in component_list:
-        if isinstance(component, CubitInstance):
-            instances.append(component)
-        elif isinstance(component, SimpleComponent):
-            instances += component.subcomponents
-        elif isinstance(component, GenericComponentAssembly):
-            instances += component.get_all_geometries()
+        # components and CubitInstances both provide get_geometries
+        get_geometries = getattr(component, "get_geometries", None)
+        if get_geometries is not None:
+            instances.extend(get_geometries())
     return instances
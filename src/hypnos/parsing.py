@@ -7,8 +7,14 @@ Classes and functions to process json files describing the parameters
 (c) Copyright UKAEA 2024
 '''
 
-import json
 import copy
+import functools
+import os
+# orjson parses much faster, fall back to the standard library without it
+try:
+    import orjson as json
+except ImportError:
+    import json
 from hypnos.default_params import DEFAULTS
 from hypnos.generic_classes import CubismError
 
@@ -26,10 +32,18 @@ def extract_data(filename) -> dict:
     dict
         data inside json file
     '''
-    with open(filename) as jsonFile:
-        data = jsonFile.read()
-        objects = json.loads(data)
-    return objects
+    # parse on every call so callers can modify what they get back
+    path = os.path.abspath(filename)
+    return json.loads(_read_file(path, os.stat(path).st_mtime_ns))
+
+
+# bounded, since every modification of a file adds a new entry
+@functools.lru_cache(maxsize=128)
+def _read_file(path: str, modified_time: int) -> bytes:
+    '''Read a file's bytes once per modification time.
+    Both json parsers take bytes, which skips decoding to str first.'''
+    with open(path, "rb") as jsonFile:
+        return jsonFile.read()
 
 
 def extract_if_string(possible_filename):
@@ -72,6 +86,26 @@ def delve(component_obj: list | dict):
     raise TypeError(f"Unrecognised delvee: {component_obj}")
 
 
+def map_defaults_by_class(defaults: list[dict]) -> dict:
+    '''Key default configs by their lowercase class.
+    If several configs share a class, the first one listed wins.
+
+    Parameters
+    ----------
+    defaults : list[dict]
+        default configs
+
+    Returns
+    -------
+    dict
+        {lowercase class: default config}
+    '''
+    return {default_config["class"].lower(): default_config for default_config in reversed(defaults)}
+
+
+DEFAULTS_BY_CLASS = map_defaults_by_class(DEFAULTS)
+
+
 class ParameterFiller():
     '''Process json files. Fill in missed input parameters with defaults.
 
@@ -128,9 +162,9 @@ class ParameterFiller():
 
     def __get_config(self):
         '''Fetch default config for given class if it exists'''
-        for default_class in DEFAULTS:
-            if default_class["class"].lower() == self.design_tree["class"].lower():
-                return copy.deepcopy(default_class)
+        default_config = DEFAULTS_BY_CLASS.get(self.design_tree["class"].lower())
+        if default_config is not None:
+            return copy.deepcopy(default_config)
         self.add_log(f"Default configuration not found for: {self.design_tree['class']}")
         return False
 
@@ -154,7 +188,7 @@ class ParameterFiller():
         # we look at every key-value pair in the default dictionary
         for key, default_value in config.items():
             # stuff we do if the corresponding key also exists in our dictionary
-            if key in design_tree.keys():
+            if key in design_tree:
                 if type(default_value) is dict:
                     # if there is another layer of nesting, recurse
                     # set our value to the filled dictionary that gets returned
@@ -171,18 +205,18 @@ class ParameterFiller():
 
     def __setup_tree(self, design_tree: dict):
         '''Start logging a class and process any references to filenames'''
-        if "class" in design_tree.keys():
+        if "class" in design_tree:
             self.add_log(f"---------- Logging class: {design_tree['class']} ----------")
-        if "components" in design_tree.keys():
+        if "components" in design_tree:
             design_tree["components"] = delve(design_tree["components"])
         return design_tree
 
     def __cleanup_logs(self, design_tree: dict, config: dict):
         '''Log if design_tree has any keys missing from the config,
         Finish logging class'''
-        for key in list(set(design_tree.keys()) - set(config.keys())):
+        for key in design_tree.keys() - config.keys():
             self.add_log(f"key {key} not in default config")
-        if "class" in design_tree.keys():
+        if "class" in design_tree:
             self.add_log(f"---------- Finished logging class: {design_tree['class']} ----------")
 
 
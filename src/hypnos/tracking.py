@@ -43,11 +43,12 @@ class Tracker:
             component to track
         '''
         if isinstance(root_component, SimpleComponent):
-            self.components += [root_component]
+            self.components.append(root_component)
             self.materials.add(root_component.material)
         elif isinstance(root_component, GenericComponentAssembly):
-            self.components += root_component.get_all_components()
-            self.materials = self.materials.union({component.material for component in root_component.get_all_components()})
+            components = root_component.get_all_components()
+            self.components.extend(components)
+            self.materials.update(component.material for component in components)
 
     def track_boundaries(self):
         '''Find boundaries between simple components.
@@ -59,17 +60,18 @@ class Tracker:
         surface_to_comp_id = {}
         # material : [volumes made of material]
         material_to_volumes = {}
+        # volume ID strings of each component, these need cubit queries to build
+        volume_id_strings = []
 
         # For each component we want to keep track of
         # 1) The material its volumes are made of
         # 2) Its surface IDs
         # This is used to populate the above dictionaries
         for idx, component in enumerate(self.components):
-            # initialise
-            if component.material not in material_to_volumes.keys():
-                material_to_volumes[component.material] = []
+            volume_id_string = component.volume_id_string()
+            volume_id_strings.append(volume_id_string)
             # add volumes to corresponding materials
-            material_to_volumes[component.material].append(component.volume_id_string())
+            material_to_volumes.setdefault(component.material, []).append(volume_id_string)
 
             for surf_id in [surface.cid for surface in to_surfaces(component.get_geometries())]:
                 # initialise
@@ -117,13 +119,13 @@ class Tracker:
             cmd(f'create material name "{material}"')
 
         # add blocks for each simple component
-        for component in self.components:
+        for component, volume_id_string in zip(self.components, volume_id_strings):
             entity_id = cubit.get_next_block_id()
             cmd(f"create block {entity_id}")
             cmd(f'block {entity_id} name "{component.identifier}"')
-            cmd(f'block {entity_id} add volume {component.volume_id_string()}')
+            cmd(f'block {entity_id} add volume {volume_id_string}')
             cmd(f'block {entity_id} material "{component.material}"')
-            add_to_new_entity("group", component.identifier, "volume", component.volume_id_string())
+            add_to_new_entity("group", component.identifier, "volume", volume_id_string)
 
         # add groups for each material
         for material_name, vol_id_strings in material_to_volumes.items():
@@ -1,5 +1,79 @@
 import pytest
 from hypnos.assemblies import GenericComponentAssembly
 from hypnos.components import SimpleComponent
+from hypnos.generic_classes import CubitInstance
+import cubit
 
 
+class BodyComponent(SimpleComponent):
+    '''This class exists for testing purposes'''
+    def __init__(self):
+        super().__init__("body_component", {})
+
+    def make_geometry(self):
+        cubit.brick(1, 1, 1)
+        return CubitInstance(1, "body")
+
+
+@pytest.fixture(scope="function")
+def nested_assembly():
+    inner = GenericComponentAssembly("inner", {})
+    outer = GenericComponentAssembly("outer", {})
+    outer.add_components(inner)
+    return outer, inner
+
+
+def test_get_components_of_class(nested_assembly):
+    outer, inner = nested_assembly
+    assert outer.get_components_of_class(GenericComponentAssembly) == [inner]
+    assert outer.get_components_of_class([SimpleComponent]) == []
+    assert outer.get_components_of_class((SimpleComponent, GenericComponentAssembly)) == [inner]
+
+
+def test_clear_cache(nested_assembly):
+    outer, inner = nested_assembly
+    assert outer.get_components_of_class(GenericComponentAssembly) == [inner]
+    new_assembly = GenericComponentAssembly("new", {})
+    outer.components.append(new_assembly)
+    outer.clear_cache()
+    assert outer.get_components_of_class(GenericComponentAssembly) == [inner, new_assembly]
+
+
+def test_add_components_clears_parents(nested_assembly, brick):
+    outer, inner = nested_assembly
+    assert outer.get_components_of_class(CubitInstance) == []
+    inner.add_components(brick)
+    assert outer.get_components_of_class(CubitInstance) == [brick]
+
+
+def test_get_geometries_after_as_volumes(nested_assembly):
+    outer, inner = nested_assembly
+    component = BodyComponent()
+    inner.add_components(component)
+    assert [geom.geometry_type for geom in outer.get_geometries()] == ["body"]
+    component.as_volumes()
+    assert [geom.geometry_type for geom in outer.get_geometries()] == ["volume"]
+
+
+def test_get_geometries_after_add_components(nested_assembly, brick):
+    outer, inner = nested_assembly
+    assert outer.get_geometries() == []
+    inner.add_components(brick)
+    assert outer.get_geometries() == [brick]
+
+
+def test_find_components_of_class(nested_assembly):
+    outer, inner = nested_assembly
+    second = GenericComponentAssembly("second", {})
+    outer.components.append(second)
+    assert outer.find_components_of_class(GenericComponentAssembly) == [inner, second]
+
+
+def test_partition_components_by_class(nested_assembly):
+    outer, inner = nested_assembly
+    deepest = GenericComponentAssembly("deepest", {})
+    inner.components.append(deepest)
+    partitions = outer.partition_components_by_class((GenericComponentAssembly, SimpleComponent))
+    assert partitions[GenericComponentAssembly] == outer.find_components_of_class(GenericComponentAssembly)
+    assert partitions[GenericComponentAssembly] == [inner]
+    assert partitions[SimpleComponent] == []
@@ -178,6 +178,18 @@ def test_subtract(brick):
     assert brick2.cid == remains[0].cid
 
 
+def test_subtract_keep_split(brick):
+    # cutting a slab through the middle leaves two new bodies
+    slab = cmd_geom("create brick x 3 y 3 z 0.2", "body")
+    pieces = subtract([brick], [slab], destroy=False)
+    assert len(pieces) == 2
+    body_ids = cubit.get_entities("body")
+    assert all(piece.cid in body_ids for piece in pieces)
+    assert brick.cid in body_ids
+    assert slab.cid in body_ids
+    assert sum(piece.handle.volume() for piece in pieces) == pytest.approx(0.8)
+
+
 def test_union(brick):
     brick.move([0.5, 0, 0])
     brick2 = cmd_geom("brick x 1", "body")
@@ -36,6 +36,10 @@ def test_stringify(brick):
     assert str(brick) == "body 1"
 
 
+def test_get_geometries(brick):
+    assert brick.get_geometries() == [brick]
+
+
 def test_copy(brick):
     # am i allowed to use union here smiley face
     brick_vol = cubit.get_volume_volume(brick.cid)
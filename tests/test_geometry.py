@@ -7,6 +7,7 @@ from hypnos.geometry import (
     make_loop,
     hypotenuse,
     arctan,
+    hexagonal_lattice,
     Vertex,
     make_surface,
     Line,
@@ -15,6 +16,7 @@ from hypnos.geometry import (
     unroll,
     blunt_corners,
     create_brick,
+    move,
     rotate,
     sweep_about,
     sweep_along
@@ -175,6 +177,16 @@ def test_arctan():
     assert arctan(3, -3) == 3*np.pi/4
 
 
+def test_hexagonal_lattice():
+    x, y, fits = hexagonal_lattice(3, 2, 2, -1, 10, 3)
+    assert x.shape == y.shape == fits.shape == (2, 3)
+    assert x[0] == approx([-1, -1 + np.sqrt(3), -1 + 2*np.sqrt(3)])
+    assert y[0] == approx([10, 9, 10])
+    assert y[1] == approx([8, 7, 8])
+    # only 3 distinct heights, so the lower pins of the second column index don't fit
+    assert fits.tolist() == [[True, True, True], [True, False, True]]
+
+
 # tests for Vertex
 def test_eq(vertex):
     assert vertex == Vertex(1, 2, 3)
@@ -342,6 +354,14 @@ def test_create_brick():
     assert brick.handle.volume() == 5
 
 
+def test_move():
+    brick = create_brick(1, 1, 1)
+    brick2 = create_brick(1, 1, 1)
+    move([brick, brick2], (1, 2, 3))
+    assert brick.handle.centroid() == approx((1, 2, 3))
+    assert brick2.handle.centroid() == approx((1, 2, 3))
+
+
 def test_rotate():
     brick = create_brick(10, 1, 1)
     rotate(
@@ -161,6 +161,28 @@ def test_get_param(parsed):
         parsed.get_param("haha")
 
 
+def test_nested_params(parsed):
+    parsed.change_params({"geometry/offset": {"x": 1}})
+    parsed.change_params({"geometry/offset/x": 2})
+    assert parsed.get_param("geometry/offset/x") == 2
+    assert parsed.get_param("geometry/offset") == {"x": 2}
+    assert parsed.get_param("class") == "pin"
+
+
+def test_bad_param_paths(parsed):
+    # missing keys
+    with raise_cubism:
+        parsed.get_param("geometry/not a path")
+    with raise_cubism:
+        parsed.change_params({"not a path/offset": 3})
+    # routes through a value that isn't a dictionary
+    with raise_cubism:
+        parsed.get_param("geometry/offset/x")
+    with raise_cubism:
+        parsed.change_params({"geometry/offset/x": 3})
+    assert parsed.design_tree == PIN
+
+
 def test_export_stp(goldpath, parsed, tmp_path):
     goldfile = goldpath / PIN_STP
     stp_path = tmp_path / "pin"
@@ -3,12 +3,15 @@ from hypnos.parsing import (
     extract_if_string,
     delve,
     ParameterFiller,
-    get_format_extension
+    get_format_extension,
+    map_defaults_by_class
 )
+import hypnos.parsing
 from hypnos.default_params import HCPB_BLANKET
 from hypnos.generic_classes import CubismError
 import pytest
 import pathlib
+import os
 
 cubism_err = pytest.raises(CubismError)
 type_err = pytest.raises(TypeError)
@@ -36,6 +39,16 @@ def test_extract_data(filename):
     assert check(data)
 
 
+def test_extract_data_after_edit(tmp_path):
+    file = tmp_path / "edited.json"
+    file.write_text('{"class": "first"}')
+    os.utime(file, ns=(1, 1))
+    assert extract_data(file)["class"] == "first"
+    file.write_text('{"class": "second"}')
+    os.utime(file, ns=(2, 2))
+    assert extract_data(file)["class"] == "second"
+
+
 def test_extract_if_string(filename):
     data = extract_if_string(filename)
     assert check(data)
@@ -92,6 +105,14 @@ def test_unfilled_params(p_filler):
     assert nodef_log in p_filler.log
 
 
+def test_duplicate_defaults(p_filler, monkeypatch):
+    first = {"class": "duplicate", "geometry": {"length": 1}}
+    second = {"class": "Duplicate", "geometry": {"length": 2}}
+    monkeypatch.setattr(hypnos.parsing, "DEFAULTS_BY_CLASS", map_defaults_by_class([first, second]))
+    filled = p_filler.process_design_tree({"class": "DUPLICATE"})
+    assert filled["geometry"] == {"length": 1}
+
+
 def test_get_format_extension():
     assert get_format_extension("Cubit") == ".cub5"
     assert get_format_extension("exodus") == ".e"